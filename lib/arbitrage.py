@@ -1,8 +1,12 @@
 """Core arbitrage logic for PolyClaw."""
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import List, Dict, Optional
 
-@dataclass
+import numpy as np
+
+# Legs are created by the thousand during scans; slots halve the
+# per-instance memory. Not frozen: scanners refresh leg.price in place.
+@dataclass(slots=True)
 class ArbitrageLeg:
     token_id: str
     side: str  # "YES" or "NO"
@@ -10,14 +14,14 @@ class ArbitrageLeg:
     market_id: str
     question: str
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ExecutionStep:
     market_id: str
     position: str
     amount: float
     description: str
 
-@dataclass
+@dataclass(slots=True)
 class ArbitragePortfolio:
     type: str  # "SPLIT" or "NEGRISK"
     legs: List[ArbitrageLeg]
@@ -27,24 +31,41 @@ class ArbitragePortfolio:
     
     def get_execution_steps(self, total_capital: float) -> List[ExecutionStep]:
         """Generate 'Split + Sell' steps for this portfolio."""
-        steps = []
-        for leg in self.legs:
-            # For each leg, we need to split $Amount and sell the OTHER side
-            # Leg price is the 'market price' we used for calculation
-            steps.append(ExecutionStep(
+        # For each leg, we need to split $Amount and sell the OTHER side.
+        # Leg price is the 'market price' we used for calculation.
+        inv_total = 1.0 / self.total_cost
+        return [
+            ExecutionStep(
                 market_id=leg.market_id,
                 position=leg.side,
-                amount=total_capital * (leg.price / self.total_cost),
-                description=f"Enter {leg.side} on {leg.market_id} via Split"
-            ))
-        return steps
+                amount=total_capital * leg.price * inv_total,
+                description=f"Enter {leg.side} on {leg.market_id} via Split",
+            )
+            for leg in self.legs
+        ]
+
+def _sum_cost_split(agg_market, component_markets) -> float:
+    """Cheap cost sum for a hierarchical split (no leg allocation)."""
+    return agg_market.no_price + sum(m.yes_price for m in component_markets)
 
-def calculate_split_arbitrage(agg_market, component_markets) -> ArbitragePortfolio:
+def _sum_cost_negrisk(markets) -> float:
+    """Cheap cost sum for a NegRisk group (no leg allocation)."""
+    return sum(m.yes_price for m in markets)
+
+def calculate_split_arbitrage(agg_market, component_markets, min_profit: Optional[float] = None) -> Optional[ArbitragePortfolio]:
     """
     Calculate spread for hierarchical split:
     Agg NO + Component1 YES + Component2 YES ...
     Total cost < 1.0 implies arbitrage.
+
+    If min_profit is given, the cost is summed first and None is returned
+    for non-arbitrage groups without allocating any legs - most candidates
+    in a scan fail this check, so skipping leg construction for them keeps
+    allocation (and GC) pressure down.
     """
+    if min_profit is not None and (1.0 - _sum_cost_split(agg_market, component_markets)) < min_profit:
+        return None
+
     legs = []
     # Buy Aggregate NO
     legs.append(ArbitrageLeg(
@@ -78,11 +99,60 @@ def calculate_split_arbitrage(agg_market, component_markets) -> ArbitragePortfol
         description=f"Hierarchical Split on {agg_market.question}"
     )
 
-def calculate_negrisk_arbitrage(markets) -> ArbitragePortfolio:
+def negrisk_group_costs(groups: List[list]) -> np.ndarray:
+    """Total YES cost per NegRisk group, computed column-wise.
+
+    Flattens every group's YES prices into one contiguous array and sums
+    per-group with a single np.add.reduceat over the group offsets, rather
+    than walking Market objects group by group. Scans covering thousands
+    of event groups pay one sequential pass instead of N scattered
+    attribute reads.
+    """
+    if not groups:
+        return np.empty(0, dtype=np.float64)
+    sizes = np.fromiter((len(g) for g in groups), dtype=np.intp, count=len(groups))
+    prices = np.fromiter(
+        (m.yes_price for g in groups for m in g),
+        dtype=np.float64,
+        count=int(sizes.sum()),
+    )
+    # reduceat with duplicate offsets (which empty groups would produce)
+    # sums the wrong segment; reduce over the non-empty groups only and
+    # leave empty ones at their correct cost of 0.0.
+    costs = np.zeros(len(groups), dtype=np.float64)
+    nonempty = np.flatnonzero(sizes)
+    if nonempty.size:
+        offsets = np.zeros(nonempty.size, dtype=np.intp)
+        np.cumsum(sizes[nonempty][:-1], out=offsets[1:])
+        costs[nonempty] = np.add.reduceat(prices, offsets)
+    return costs
+
+def scan_negrisk_groups(groups: List[list], min_profit: float = 0.0) -> List[ArbitragePortfolio]:
+    """Scan many NegRisk groups, materializing only profitable portfolios.
+
+    The cost of every group is computed in one vectorized pass; legs are
+    only allocated for the (typically few) groups clearing min_profit.
+    """
+    costs = negrisk_group_costs(groups)
+    # A cost of 0.0 from an empty group is not a free arbitrage; require
+    # at least one leg before a group can clear min_profit.
+    sizes = np.fromiter((len(g) for g in groups), dtype=np.intp, count=len(groups))
+    return [
+        calculate_negrisk_arbitrage(groups[i])
+        for i in np.flatnonzero((sizes > 0) & ((1.0 - costs) >= min_profit))
+    ]
+
+def calculate_negrisk_arbitrage(markets, min_profit: Optional[float] = None) -> Optional[ArbitragePortfolio]:
     """
     Calculate spread for NegRisk (Mutually Exclusive Outcomes):
     Sum(YES prices) < 1.0 implies arbitrage.
+
+    If min_profit is given, non-arbitrage groups return None after a cheap
+    price sum, skipping leg allocation entirely.
     """
+    if min_profit is not None and (1.0 - _sum_cost_negrisk(markets)) < min_profit:
+        return None
+
     legs = []
     total_cost = 0.0
     
@@ -4,29 +4,136 @@ Wraps py-clob-client for order execution with proxy support.
 Includes retry logic for Cloudflare blocks when using rotating proxies.
 """
 
+import asyncio
 import os
 import time
 from typing import Optional
 
 import httpx
+import numpy as np
+
+try:
+    from py_clob_client.client import ClobClient
+    from py_clob_client.clob_types import OrderArgs, OrderType
+    from py_clob_client.order_builder.constants import BUY, SELL
+    import py_clob_client.http_helpers.helpers as clob_helpers
+
+    _CLOB_AVAILABLE = True
+except ImportError:
+    _CLOB_AVAILABLE = False
+
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional (install with the "perf" extra); fall back to the
+    # plain-Python walk, which is still fast on the pre-parsed arrays.
+    def njit(*args, **kwargs):
+        def wrap(fn):
+            return fn
+        return wrap
 
 # Max retries for Cloudflare blocks (with rotating proxy, each retry gets new IP)
 CLOB_MAX_RETRIES = int(os.environ.get("CLOB_MAX_RETRIES", "5"))
 
+# Order book cache TTL. Books are refetched after this long; within one arb
+# evaluation the same book may be consulted several times (check_liquidity,
+# sell_robust), and a ~1s TTL collapses those into a single HTTP round-trip.
+BOOK_TTL_MS = int(os.environ.get("BOOK_TTL_MS", "1000"))
+
+
+def _normalize_book(book) -> tuple[list, list]:
+    """Normalize a py-clob-client order book to a (bids, asks) tuple.
+
+    The client may return either an object with .bids/.asks or a plain
+    dict; doing the hasattr branching once at the fetch boundary keeps it
+    out of every downstream liquidity check.
+    """
+    if hasattr(book, "bids"):
+        return book.bids, book.asks
+    return book.get("bids", []), book.get("asks", [])
+
+
+def _parse_book_levels(orders: list) -> tuple[np.ndarray, np.ndarray]:
+    """Parse (price_str, size_str) order book levels into float64 columns."""
+    n = len(orders)
+    prices = np.fromiter((float(o[0]) for o in orders), dtype=np.float64, count=n)
+    sizes = np.fromiter((float(o[1]) for o in orders), dtype=np.float64, count=n)
+    return prices, sizes
+
+
+@njit(cache=True)
+def _walk_bids(prices: np.ndarray, sizes: np.ndarray, limit: float, amount: float) -> bool:
+    """Cumulative-sum walk over bids (ordered high->low) with early exit.
+
+    The first level below the price limit ends the walk - no later level
+    can qualify.
+    """
+    total = 0.0
+    for i in range(prices.shape[0]):
+        if prices[i] < limit:
+            return False
+        total += sizes[i]
+        if total >= amount:
+            return True
+    return False
+
+
+@njit(cache=True)
+def _walk_asks(prices: np.ndarray, sizes: np.ndarray, limit: float, amount: float) -> bool:
+    """Cumulative-sum walk over asks (ordered low->high) with early exit."""
+    total = 0.0
+    for i in range(prices.shape[0]):
+        if prices[i] > limit:
+            return False
+        total += sizes[i]
+        if total >= amount:
+            return True
+    return False
+
+
+def _walk_book(
+    prices: np.ndarray, sizes: np.ndarray, limit: float, amount: float, is_sell: bool
+) -> bool:
+    """Dispatch to the side-specialized walk (sells consume bids)."""
+    walk = _walk_bids if is_sell else _walk_asks
+    return walk(prices, sizes, limit, amount)
+
 
 class ClobClientWrapper:
     """Wrapper around py-clob-client for trading."""
 
     def __init__(self, private_key: str, address: str):
+        if not _CLOB_AVAILABLE:
+            raise ImportError(
+                "py-clob-client not installed. Run: pip install py-clob-client"
+            )
         self.private_key = private_key
         self.address = address
         self._client = None
         self._creds = None
+        # token_id -> (fetch time, (bids, asks)) in the normalized tuple form
+        self._book_cache: dict[str, tuple[float, tuple[list, list]]] = {}
+
+    def _make_http_client(self) -> httpx.Client:
+        """Build the long-lived pooled HTTP client (HTTP/2 + keep-alive)."""
+        proxy = os.environ.get("HTTPS_PROXY") or os.environ.get("HTTP_PROXY")
+        return httpx.Client(
+            http2=True,
+            proxy=proxy,
+            timeout=30.0,
+            limits=httpx.Limits(
+                max_connections=32,
+                max_keepalive_connections=16,
+                keepalive_expiry=60.0,
+            ),
+        )
 
     def _refresh_http_client(self):
-        """Create a fresh HTTP client (for IP rotation with proxies)."""
-        import py_clob_client.http_helpers.helpers as clob_helpers
+        """Recycle the HTTP client after a Cloudflare block (new IP with rotating proxies).
 
+        Only called on the block path - tearing down the client otherwise
+        would throw away keep-alive connections and TLS session state.
+        """
         proxy = os.environ.get("HTTPS_PROXY") or os.environ.get("HTTP_PROXY")
         if proxy:
             # Close old client if exists
@@ -36,26 +143,13 @@ class ClobClientWrapper:
                 except Exception:
                     pass
             # Create fresh client (gets new IP with rotating proxies)
-            clob_helpers._http_client = httpx.Client(
-                http2=True, proxy=proxy, timeout=30.0
-            )
+            clob_helpers._http_client = self._make_http_client()
 
     def _init_client(self):
         """Initialize CLOB client with optional proxy support."""
-        try:
-            from py_clob_client.client import ClobClient
-            import py_clob_client.http_helpers.helpers as clob_helpers
-        except ImportError:
-            raise ImportError(
-                "py-clob-client not installed. Run: pip install py-clob-client"
-            )
-
-        # Configure proxy if available
-        proxy = os.environ.get("HTTPS_PROXY") or os.environ.get("HTTP_PROXY")
-        if proxy:
-            clob_helpers._http_client = httpx.Client(
-                http2=True, proxy=proxy, timeout=30.0
-            )
+        # Install one pooled client for the whole session; it is only
+        # recycled on Cloudflare blocks (see _refresh_http_client).
+        clob_helpers._http_client = self._make_http_client()
 
         # Initialize client
         self._client = ClobClient(
@@ -81,9 +175,71 @@ class ClobClientWrapper:
         """Check if error is a Cloudflare block."""
         return "403" in error_msg and ("cloudflare" in error_msg.lower() or "blocked" in error_msg.lower())
 
-    def get_order_book(self, token_id: str) -> dict:
-        """Get order book for a token."""
-        return self.client.get_order_book(token_id)
+    def get_order_book(self, token_id: str) -> tuple[list, list]:
+        """Get a (bids, asks) order book for a token (cached for BOOK_TTL_MS)."""
+        now = time.monotonic()
+        cached = self._book_cache.get(token_id)
+        if cached is not None and (now - cached[0]) * 1000 < BOOK_TTL_MS:
+            return cached[1]
+
+        book = _normalize_book(self.client.get_order_book(token_id))
+        self._book_cache[token_id] = (now, book)
+        return book
+
+    def invalidate(self, token_id: str) -> None:
+        """Drop the cached order book for a token (e.g. after trading it)."""
+        self._book_cache.pop(token_id, None)
+
+    async def prefetch_order_books(self, token_ids: list[str]) -> None:
+        """Fetch order books for many tokens concurrently into the cache.
+
+        N sequential book fetches become one round-trip of concurrent
+        requests; subsequent check_liquidity/sell calls within the TTL hit
+        the cache.
+        """
+        now = time.monotonic()
+        to_fetch = [
+            tid for tid in dict.fromkeys(token_ids)
+            if (cached := self._book_cache.get(tid)) is None
+            or (now - cached[0]) * 1000 >= BOOK_TTL_MS
+        ]
+        if not to_fetch:
+            return
+
+        proxy = os.environ.get("HTTPS_PROXY") or os.environ.get("HTTP_PROXY")
+        async with httpx.AsyncClient(http2=True, proxy=proxy, timeout=30.0) as client:
+            responses = await asyncio.gather(
+                *[
+                    client.get("https://clob.polymarket.com/book", params={"token_id": tid})
+                    for tid in to_fetch
+                ],
+                return_exceptions=True,
+            )
+
+        for tid, resp in zip(to_fetch, responses):
+            if isinstance(resp, Exception) or resp.status_code != 200:
+                continue
+            data = resp.json()
+            # Normalize to the (price, size) pair shape the walk expects
+            book = (
+                [(l["price"], l["size"]) for l in data.get("bids", [])],
+                [(l["price"], l["size"]) for l in data.get("asks", [])],
+            )
+            self._book_cache[tid] = (time.monotonic(), book)
+
+    async def sell_robust_multi(
+        self, legs: list[tuple[str, float, float]]
+    ) -> list[tuple[Optional[str], bool, Optional[str]]]:
+        """Sell multiple legs, pre-fetching all order books concurrently.
+
+        Each leg is (token_id, amount, price); execution itself stays
+        sequential so fills remain ordered and easy to reason about.
+        """
+        await self.prefetch_order_books([token_id for token_id, _, _ in legs])
+        return [
+            self.sell_robust(token_id, amount, price)
+            for token_id, amount, price in legs
+        ]
 
     def check_liquidity(self, token_id: str, side: str, amount: float, min_price: float) -> bool:
         """
@@ -98,37 +254,18 @@ class ClobClientWrapper:
         Returns:
             True if sufficient liquidity exists within price limits.
         """
-        book = self.get_order_book(token_id)
         # If we want to SELL, we look at BIDS. If BUY, we look at ASKS.
-        # Note: py-clob-client returns orderbook with 'bids' and 'asks' lists of Strings
-        bids = book.bids if hasattr(book, 'bids') else book.get('bids', [])
-        asks = book.asks if hasattr(book, 'asks') else book.get('asks', [])
-        
-        orders = bids if side.lower() == "sell" else asks
-        
-        total_fillable = 0.0
-        
-        # Determine strict price condition
+        bids, asks = self.get_order_book(token_id)
+
+        is_sell = side.lower() == "sell"
+        orders = bids if is_sell else asks
+        if not orders:
+            return False
+
         # Sell: We want bids >= min_price
         # Buy: We want asks <= min_price (here 'min_price' acts as max acceptable buy price)
-        limit_price = float(min_price)
-        
-        for price_str, size_str in orders:
-            price = float(price_str)
-            size = float(size_str)
-            
-            isValidPrice = (price >= limit_price) if side.lower() == "sell" else (price <= limit_price)
-            
-            if isValidPrice:
-                total_fillable += size
-                if total_fillable >= amount:
-                    return True
-            else:
-                # Bids are ordered High->Low. If we hit a bid < min_price, no subsequent bids will work.
-                # Asks are ordered Low->High. If we hit an ask > max_price, no subsequent asks will work.
-                break
-                
-        return False
+        prices, sizes = _parse_book_levels(orders)
+        return bool(_walk_book(prices, sizes, float(min_price), float(amount), is_sell))
 
     def sell_fok(
         self,
@@ -147,9 +284,6 @@ class ClobClientWrapper:
         Returns:
             Tuple of (order_id, filled, error_message)
         """
-        from py_clob_client.clob_types import OrderArgs, OrderType
-        from py_clob_client.order_builder.constants import SELL
-
         # Set low price to match any buy orders (market sell)
         # Undercut by 10% or min 0.01
         sell_price = round(max(price * 0.90, 0.01), 2)
@@ -175,6 +309,7 @@ class ClobClientWrapper:
                 )
                 result = self.client.post_order(order, OrderType.FOK)
                 order_id = result.get("orderID", str(result)[:40])
+                self.invalidate(token_id)
                 return order_id, True, None
 
             except Exception as e:
@@ -220,9 +355,7 @@ class ClobClientWrapper:
             return fok_id, True, None
             
         print(f"  FOK failed ({err}). Attempting Aggressive Limit Sell...")
-        from py_clob_client.clob_types import OrderArgs, OrderType
-        from py_clob_client.order_builder.constants import SELL
-        
+
         # 2. Check liquidity for the whole amount at a very low price (e.g. 0.05)
         # This effectively market sells into whatever bids exist
         has_liquidity = self.check_liquidity(token_id, "sell", amount, 0.05)
@@ -244,9 +377,10 @@ class ClobClientWrapper:
                 )
             )
             # Use GTC so it rests if partial
-            res = self.client.post_order(order, OrderType.GTC) 
+            res = self.client.post_order(order, OrderType.GTC)
             order_id = res.get("orderID", str(res)[:40])
-            return order_id, True, "Placed Aggressive GTC Limit" 
+            self.invalidate(token_id)
+            return order_id, True, "Placed Aggressive GTC Limit"
         except Exception as e:
             return None, False, f"GTC Limit failed: {str(e)}"
 
@@ -268,9 +402,6 @@ class ClobClientWrapper:
             Tuple of (order_id, error_message)
         """
         try:
-            from py_clob_client.clob_types import OrderArgs, OrderType
-            from py_clob_client.order_builder.constants import BUY
-
             order = self.client.create_order(
                 OrderArgs(
                     token_id=token_id,
@@ -133,3 +133,21 @@ CTF_ABI = [
         "type": "function",
     },
 ]
+
+REDEMPTION_ABI = [
+    {
+        "inputs": [
+            {"name": "collateralToken", "type": "address"},
+            {"name": "parentCollectionId", "type": "bytes32"},
+            {"name": "conditionId", "type": "bytes32"},
+            {"name": "indexSets", "type": "uint256[]"},
+        ],
+        "name": "redeemPositions",
+        "outputs": [],
+        "stateMutability": "nonpayable",
+        "type": "function",
+    }
+]
+
+# Full CTF interface (split/merge/redeem), concatenated once at import
+FULL_CTF_ABI = CTF_ABI + REDEMPTION_ABI
@@ -20,6 +20,20 @@ Tier classification:
     - TIER 4 (LOW):      <85% - speculative
 """
 
+from dataclasses import dataclass
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional (install with the "perf" extra); fall back to the
+    # plain-Python path, which NumPy still vectorizes most of.
+    def njit(*args, **kwargs):
+        def wrap(fn):
+            return fn
+        return wrap
+
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
@@ -38,17 +52,35 @@ TIER_THRESHOLDS = [
     (0.00, 4, "LOW", "speculative"),
 ]
 
+# Precomputed ascending thresholds for binary-search classification.
+# np.searchsorted(_THRESHOLDS, coverage, side="right") yields a bucket index
+# (0 = below all thresholds); _TIER_BY_BUCKET maps buckets to tier numbers.
+_THRESHOLDS = np.array([0.85, 0.90, 0.95])
+_TIER_BY_BUCKET = np.array([4, 3, 2, 1])
+_TIER_LABELS = {tier: label for _, tier, label, _ in TIER_THRESHOLDS}
+_TIER_DESCRIPTIONS = {tier: desc for _, tier, _, desc in TIER_THRESHOLDS}
+
 
 # =============================================================================
 # METRICS CALCULATION
 # =============================================================================
 
 
+def _round4(x: float) -> float:
+    """Quantize to 4 decimals with np.round semantics.
+
+    stdlib round() and np.round disagree on some tie values (e.g.
+    0.95175 -> 0.9517 vs 0.9518), so the scalar and batch paths both
+    round through numpy to stay bit-for-bit comparable.
+    """
+    return float(np.round(x, 4))
+
+
 def calculate_coverage_metrics(
     target_price: float,
     cover_probability: float,
     total_cost: float,
-) -> dict:
+) -> dict[str, float]:
     """
     Calculate coverage and expected value for a portfolio.
 
@@ -73,12 +105,68 @@ def calculate_coverage_metrics(
     expected_profit = coverage - total_cost
 
     return {
-        "coverage": round(coverage, 4),
-        "loss_probability": round(loss_probability, 4),
-        "expected_profit": round(expected_profit, 4),
+        "coverage": _round4(coverage),
+        "loss_probability": _round4(loss_probability),
+        "expected_profit": _round4(expected_profit),
     }
 
 
+def calculate_coverage_metrics_batch(
+    target_prices: np.ndarray,
+    cover_probs: np.ndarray,
+    total_costs: np.ndarray,
+) -> dict[str, np.ndarray]:
+    """
+    Vectorized calculate_coverage_metrics over arrays of portfolios.
+
+    Same math as the scalar version, but one NumPy pass over all candidates
+    instead of one Python call per (target, cover) pair. Both paths round
+    through numpy (see _round4), so results match element for element.
+
+    Args:
+        target_prices: Array of target position prices
+        cover_probs: Array of P(cover fires | target doesn't pay out)
+        total_costs: Array of total position costs
+
+    Returns:
+        Dict with coverage, loss_probability, expected_profit arrays
+    """
+    target_prices = np.asarray(target_prices, dtype=np.float64)
+    cover_probs = np.asarray(cover_probs, dtype=np.float64)
+    total_costs = np.asarray(total_costs, dtype=np.float64)
+
+    p_not_target = 1.0 - target_prices
+
+    coverage = target_prices + p_not_target * cover_probs
+    loss_probability = p_not_target * (1.0 - cover_probs)
+    expected_profit = coverage - total_costs
+
+    return {
+        "coverage": np.round(coverage, 4),
+        "loss_probability": np.round(loss_probability, 4),
+        "expected_profit": np.round(expected_profit, 4),
+    }
+
+
+def classify_tier_batch(coverages: np.ndarray, costs: np.ndarray) -> np.ndarray:
+    """
+    Classify many portfolios at once via binary search over the thresholds.
+
+    One vectorized np.searchsorted call replaces the per-portfolio Python
+    scan of TIER_THRESHOLDS.
+
+    Returns:
+        Array of tier numbers (1-4)
+    """
+    coverages = np.asarray(coverages, dtype=np.float64)
+    costs = np.asarray(costs, dtype=np.float64)
+
+    tiers = _TIER_BY_BUCKET[np.searchsorted(_THRESHOLDS, coverages, side="right")]
+    # Any cost >= 1.0 is speculative/junk (Tier 4)
+    tiers = np.where(costs >= 1.0, 4, tiers)
+    return tiers
+
+
 def classify_tier(coverage: float, total_cost: float) -> tuple[int, str]:
     """
     Classify portfolio into tier based on coverage and cost.
@@ -86,22 +174,13 @@ def classify_tier(coverage: float, total_cost: float) -> tuple[int, str]:
     Returns:
         Tuple of (tier_number, tier_label)
     """
-    # Any cost >= 1.0 is speculative/junk (Tier 4)
-    if total_cost >= 1.0:
-        return 4, "LOW"
-
-    for threshold, tier, label, _ in TIER_THRESHOLDS:
-        if coverage >= threshold:
-            return tier, label
-    return 4, "LOW"
+    tier = int(classify_tier_batch(np.array([coverage]), np.array([total_cost]))[0])
+    return tier, _TIER_LABELS[tier]
 
 
 def get_tier_description(tier: int) -> str:
     """Get description for a tier number."""
-    for _, t, label, desc in TIER_THRESHOLDS:
-        if t == tier:
-            return desc
-    return "speculative"
+    return _TIER_DESCRIPTIONS.get(tier, "speculative")
 
 
 # =============================================================================
@@ -109,6 +188,51 @@ def get_tier_description(tier: int) -> str:
 # =============================================================================
 
 
+@dataclass(slots=True)
+class Portfolio:
+    """A target + cover position pair with its coverage metrics.
+
+    Slots keep per-instance memory down and make attribute access cheaper
+    than dict lookups when filtering/sorting large scan results.
+    """
+
+    # Target info
+    target_id: str
+    target_question: str
+    target_slug: str
+    target_position: str
+    target_price: float
+    # Cover info
+    cover_id: str
+    cover_question: str
+    cover_slug: str
+    cover_position: str
+    cover_price: float
+    cover_probability: float
+    # Relationship
+    relationship: str
+    # Metrics
+    total_cost: float
+    profit: float
+    coverage: float
+    loss_probability: float
+    expected_profit: float
+    # Tier
+    tier: int
+    tier_label: str
+
+
+def portfolio_profit_pct(portfolio: Portfolio) -> float:
+    """Profit as a percentage of cost, for display.
+
+    Computed at render time rather than stored on Portfolio - it is pure
+    formatting, and scans build far more portfolios than they print.
+    """
+    if portfolio.total_cost <= 0:
+        return 0.0
+    return round(portfolio.profit / portfolio.total_cost * 100, 2)
+
+
 def build_portfolio(
     target_market: dict,
     cover_market: dict,
@@ -116,7 +240,7 @@ def build_portfolio(
     cover_position: str,
     cover_probability: float,
     relationship: str,
-) -> dict | None:
+) -> Portfolio | None:
     """
     Build a single portfolio from target and cover markets.
 
@@ -129,7 +253,7 @@ def build_portfolio(
         relationship: Explanation of the logical relationship
 
     Returns:
-        Portfolio dict or None if invalid
+        Portfolio or None if invalid
     """
     # Get prices based on positions
     if target_position == "YES":
@@ -166,61 +290,236 @@ def build_portfolio(
     # But if Target fails, it means Fed Stayed. Fed Stayed => Cut 25 (Hedge) is 0%.
     # So P(win) is actually 7%, not 98%.
     
-    # Let's enforce that for a "Necessary" hedge, the cover price must 
+    # Let's enforce that for a "Necessary" hedge, the cover price must
     # at least reflect the risk it's covering.
+    # Sanity check, coverage metrics and tier classification are fused into
+    # one block here so the hot path shares p_not_target and pays a single
+    # function call instead of three. calculate_coverage_metrics and
+    # classify_tier remain available for standalone use; the math is
+    # identical.
+    p_not_target = 1.0 - target_price
+
     if cover_probability >= 0.95:
-        p_risk = 1.0 - target_price
         # If the risk is 93% (p_risk=0.93) but the cover price is only 0.07,
-        # it's only a hedge if P(cover|risk) is high. 
-        # Market says P(cover) is 0.07. P(risk) is 0.93. 
+        # it's only a hedge if P(cover|risk) is high.
+        # Market says P(cover) is 0.07. P(risk) is 0.93.
         # So P(cover|risk) = P(cover and risk) / P(risk) <= 0.07 / 0.93 = 7.5%.
         # LLM says 98%. LLM is wrong.
-        
-        max_possible_cond_prob = cover_price / (1.0 - target_price) if target_price < 1.0 else 1.0
+
+        max_possible_cond_prob = cover_price / p_not_target if target_price < 1.0 else 1.0
         if max_possible_cond_prob < 0.5: # If market says it's <50% chance even in best case
             return None # Discard hallucination
 
-    # Calculate metrics
-    metrics = calculate_coverage_metrics(target_price, cover_probability, total_cost)
+    # Coverage = P(get paid) = P(target wins) + P(target loses) x P(cover fires)
+    raw_coverage = target_price + p_not_target * cover_probability
+    coverage = _round4(raw_coverage)
 
     # Skip low coverage portfolios
-    if metrics["coverage"] < MIN_COVERAGE:
+    if coverage < MIN_COVERAGE:
         return None
 
-    # Classify tier
-    tier, tier_label = classify_tier(metrics["coverage"], total_cost)
+    loss_probability = _round4(p_not_target * (1 - cover_probability))
+    expected_profit = _round4(raw_coverage - total_cost)
 
-    return {
+    # Classify tier (first threshold at or below the coverage wins)
+    tier, tier_label = 4, _TIER_LABELS[4]
+    if total_cost < 1.0:
+        for threshold, t, label, _ in TIER_THRESHOLDS:
+            if coverage >= threshold:
+                tier, tier_label = t, label
+                break
+
+    return Portfolio(
         # Target info
-        "target_id": target_market.get("id", ""),
-        "target_question": target_market.get("question", ""),
-        "target_slug": target_market.get("slug", ""),
-        "target_position": target_position,
-        "target_price": round(target_price, 4),
+        target_id=target_market.get("id", ""),
+        target_question=target_market.get("question", ""),
+        target_slug=target_market.get("slug", ""),
+        target_position=target_position,
+        target_price=_round4(target_price),
         # Cover info
-        "cover_id": cover_market.get("id", ""),
-        "cover_question": cover_market.get("question", ""),
-        "cover_slug": cover_market.get("slug", ""),
-        "cover_position": cover_position,
-        "cover_price": round(cover_price, 4),
-        "cover_probability": cover_probability,
+        cover_id=cover_market.get("id", ""),
+        cover_question=cover_market.get("question", ""),
+        cover_slug=cover_market.get("slug", ""),
+        cover_position=cover_position,
+        cover_price=_round4(cover_price),
+        cover_probability=cover_probability,
         # Relationship
-        "relationship": relationship,
+        relationship=relationship,
         # Metrics
-        "total_cost": round(total_cost, 4),
-        "profit": round(1.0 - total_cost, 4),
-        "profit_pct": round((1.0 - total_cost) / total_cost * 100, 2) if total_cost > 0 else 0,
-        **metrics,
+        total_cost=_round4(total_cost),
+        profit=_round4(1.0 - total_cost),
+        coverage=coverage,
+        loss_probability=loss_probability,
+        expected_profit=expected_profit,
         # Tier
-        "tier": tier,
-        "tier_label": tier_label,
-    }
+        tier=tier,
+        tier_label=tier_label,
+    )
+
+
+def build_portfolios_batch(candidates: list[tuple]) -> list[Portfolio]:
+    """
+    Build portfolios for many (target, cover) candidates in one pass.
+
+    Each candidate is a tuple mirroring build_portfolio's arguments:
+    (target_market, cover_market, target_position, cover_position,
+    cover_probability, relationship).
+
+    The filtering math (cost bounds, sanity check, minimum coverage) is
+    evaluated branchlessly over NumPy arrays, so millions of candidate pairs
+    cost a handful of vector ops instead of one Python call each. Portfolio
+    objects are only materialized for the few surviving rows. Rounding in
+    the scalar builder goes through the same numpy quantization (_round4),
+    so both paths produce identical Portfolios.
+    """
+    n = len(candidates)
+    if n == 0:
+        return []
+
+    target_prices = np.fromiter(
+        (
+            (t.get("yes_price", 0) if tp == "YES" else t.get("no_price", 0))
+            for t, _, tp, _, _, _ in candidates
+        ),
+        dtype=np.float64,
+        count=n,
+    )
+    cover_prices = np.fromiter(
+        (
+            (c.get("yes_price", 0) if cp == "YES" else c.get("no_price", 0))
+            for _, c, _, cp, _, _ in candidates
+        ),
+        dtype=np.float64,
+        count=n,
+    )
+    cover_probs = np.fromiter(
+        (prob for _, _, _, _, prob, _ in candidates),
+        dtype=np.float64,
+        count=n,
+    )
+
+    total_costs = target_prices + cover_prices
+    valid = (total_costs > 0) & (total_costs <= 2.0)
+
+    # Sanity check (same as build_portfolio): for "necessary" covers the
+    # market-implied conditional probability must support the claimed one.
+    p_risk = 1.0 - target_prices
+    max_cond_prob = np.where(p_risk > 0, cover_prices / np.where(p_risk > 0, p_risk, 1.0), 1.0)
+    valid &= (max_cond_prob >= 0.5) | (cover_probs < 0.95)
+
+    coverage = target_prices + p_risk * cover_probs
+    valid &= np.round(coverage, 4) >= MIN_COVERAGE
+
+    survivors = np.nonzero(valid)[0]
+    if survivors.size == 0:
+        return []
+
+    # One quantization pass over the surviving columns instead of ~8 scalar
+    # round() calls per portfolio.
+    raw_costs = total_costs[survivors]
+    probs = cover_probs[survivors]
+    p_not = p_risk[survivors]
+    cols = np.stack([
+        target_prices[survivors],
+        cover_prices[survivors],
+        raw_costs,
+        1.0 - raw_costs,
+        coverage[survivors],
+        p_not * (1.0 - probs),
+        coverage[survivors] - raw_costs,
+    ])
+    np.round(cols, 4, out=cols)
+    tiers = classify_tier_batch(cols[4], raw_costs)
+
+    portfolios = []
+    for k, i in enumerate(survivors):
+        target, cover, target_pos, cover_pos, prob, relationship = candidates[i]
+        tier = int(tiers[k])
+        portfolios.append(Portfolio(
+            target_id=target.get("id", ""),
+            target_question=target.get("question", ""),
+            target_slug=target.get("slug", ""),
+            target_position=target_pos,
+            target_price=float(cols[0, k]),
+            cover_id=cover.get("id", ""),
+            cover_question=cover.get("question", ""),
+            cover_slug=cover.get("slug", ""),
+            cover_position=cover_pos,
+            cover_price=float(cols[1, k]),
+            cover_probability=prob,
+            relationship=relationship,
+            total_cost=float(cols[2, k]),
+            profit=float(cols[3, k]),
+            coverage=float(cols[4, k]),
+            loss_probability=float(cols[5, k]),
+            expected_profit=float(cols[6, k]),
+            tier=tier,
+            tier_label=_TIER_LABELS[tier],
+        ))
+    return portfolios
+
+
+def build_portfolios_vectorized(
+    targets: list[dict],
+    covers: list[dict],
+    target_position: str,
+    cover_position: str,
+    cover_probability: float,
+    relationship: str,
+) -> list[Portfolio]:
+    """
+    Evaluate every target x cover pair for one relationship in a single
+    broadcasted pass.
+
+    Where build_portfolios_batch vectorizes over an explicit candidate list,
+    this builds the full N x M cost/coverage matrices with one NumPy
+    broadcast, applies the same masks, and materializes Portfolios only for
+    surviving (i, j) pairs - ~1M pair evaluations cost milliseconds instead
+    of one Python call each.
+    """
+    n, m = len(targets), len(covers)
+    if n == 0 or m == 0:
+        return []
+
+    target_key = "yes_price" if target_position == "YES" else "no_price"
+    cover_key = "yes_price" if cover_position == "YES" else "no_price"
+
+    target_prices = np.fromiter(
+        (t.get(target_key, 0) for t in targets), dtype=np.float64, count=n
+    )
+    cover_prices = np.fromiter(
+        (c.get(cover_key, 0) for c in covers), dtype=np.float64, count=m
+    )
+
+    costs = target_prices[:, None] + cover_prices[None, :]
+    valid = (costs > 0) & (costs <= 2.0)
+
+    p_risk = (1.0 - target_prices)[:, None]
+    if cover_probability >= 0.95:
+        # Same hallucination filter as build_portfolio, broadcast over pairs.
+        max_cond_prob = np.where(
+            p_risk > 0, cover_prices[None, :] / np.where(p_risk > 0, p_risk, 1.0), 1.0
+        )
+        valid &= max_cond_prob >= 0.5
+
+    coverage = target_prices[:, None] + p_risk * cover_probability
+    valid &= np.round(coverage, 4) >= MIN_COVERAGE
+
+    portfolios = []
+    for i, j in np.argwhere(valid):
+        portfolio = build_portfolio(
+            targets[i], covers[j], target_position, cover_position,
+            cover_probability, relationship,
+        )
+        if portfolio:
+            portfolios.append(portfolio)
+    return portfolios
 
 
 def filter_portfolios_by_tier(
-    portfolios: list[dict],
+    portfolios: list[Portfolio],
     max_tier: int = 2,
-) -> list[dict]:
+) -> list[Portfolio]:
     """
     Filter portfolios by maximum tier.
 
@@ -231,13 +530,13 @@ def filter_portfolios_by_tier(
     Returns:
         Filtered list
     """
-    return [p for p in portfolios if p["tier"] <= max_tier]
+    return [p for p in portfolios if p.tier <= max_tier]
 
 
 def filter_portfolios_by_coverage(
-    portfolios: list[dict],
+    portfolios: list[Portfolio],
     min_coverage: float = MIN_COVERAGE,
-) -> list[dict]:
+) -> list[Portfolio]:
     """
     Filter portfolios by minimum coverage.
 
@@ -248,9 +547,54 @@ def filter_portfolios_by_coverage(
     Returns:
         Filtered list
     """
-    return [p for p in portfolios if p["coverage"] >= min_coverage]
+    return [p for p in portfolios if p.coverage >= min_coverage]
 
 
-def sort_portfolios(portfolios: list[dict]) -> list[dict]:
+def sort_portfolios(portfolios: list[Portfolio]) -> list[Portfolio]:
     """Sort portfolios by tier (ascending) then coverage (descending)."""
-    return sorted(portfolios, key=lambda p: (p["tier"], -p["coverage"]))
+    return sorted(portfolios, key=lambda p: (p.tier, -p.coverage))
+
+
+@njit(cache=True)
+def _filter_sort_order(coverages, tiers, min_coverage, max_tier):
+    """Return indices of surviving portfolios in display order.
+
+    Composite key: tiers span 1-4 and coverages sit in [0, 1], so
+    tier * 2 - coverage sorts by tier ascending then coverage
+    descending without a tuple comparison per element. Mergesort keeps
+    the order stable, matching sort_portfolios.
+    """
+    keep = (coverages >= min_coverage) & (tiers <= max_tier)
+    idx = np.where(keep)[0]
+    order = np.argsort(tiers[idx] * 2.0 - coverages[idx], kind="mergesort")
+    return idx[order]
+
+
+def filter_sort_portfolios_batch(
+    portfolios: list[Portfolio],
+    min_coverage: float = MIN_COVERAGE,
+    max_tier: int = 2,
+) -> list[Portfolio]:
+    """Filter by coverage/tier and sort in one columnar pass.
+
+    Equivalent to filter_portfolios_by_coverage +
+    filter_portfolios_by_tier + sort_portfolios, but the predicate and
+    sort run over NumPy arrays (numba-jitted when the perf extra is
+    installed) and the survivors are gathered from the original list.
+
+    Args:
+        portfolios: List of portfolios
+        min_coverage: Minimum coverage threshold
+        max_tier: Maximum tier to include (1 = best only)
+
+    Returns:
+        Filtered list, sorted by tier (ascending) then coverage (descending)
+    """
+    if not portfolios:
+        return []
+
+    n = len(portfolios)
+    coverages = np.fromiter((p.coverage for p in portfolios), dtype=np.float64, count=n)
+    tiers = np.fromiter((p.tier for p in portfolios), dtype=np.float64, count=n)
+    order = _filter_sort_order(coverages, tiers, min_coverage, float(max_tier))
+    return [portfolios[i] for i in order]
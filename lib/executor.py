@@ -1,21 +1,61 @@
 """Unified execution engine for PolyClaw - Split + Sell logic."""
 import time
 import asyncio
+from functools import lru_cache
 from typing import Optional, Tuple
-from web3 import Web3
-from lib.contracts import CONTRACTS, CTF_ABI, POLYGON_CHAIN_ID
+from web3 import AsyncHTTPProvider, AsyncWeb3, Web3
+from lib.contracts import CONTRACTS, FULL_CTF_ABI, POLYGON_CHAIN_ID
 from lib.wallet_manager import WalletManager
 from lib.clob_client import ClobClientWrapper
 from lib.gamma_client import GammaClient
 
+# Checksumming is a keccak256 hash per call; the contract addresses never
+# change, so compute them once at import.
+CTF_ADDR = Web3.to_checksum_address(CONTRACTS["CTF"])
+USDC_ADDR = Web3.to_checksum_address(CONTRACTS["USDC_E"])
+EMPTY_BYTES32 = bytes(32)
+
+
+@lru_cache(maxsize=256)
+def _parse_condition(condition_id: str) -> bytes:
+    """Decode a 0x-prefixed (or bare) condition id into its 32 bytes."""
+    return bytes.fromhex(condition_id[2:] if condition_id.startswith("0x") else condition_id)
+
+
 class ExecutionEngine:
     """Consolidated engine for on-chain split and CLOB sell operations."""
     
     def __init__(self, wallet: WalletManager):
         self.wallet = wallet
         self.gamma = GammaClient()
-        self.w3 = Web3(Web3.HTTPProvider(self.wallet.rpc_url, request_kwargs={"timeout": 60, "proxies": {}}))
-        
+        # Async provider so pending receipts don't block the event loop
+        # (split_and_sell overlaps CLOB HTTP work with on-chain waits).
+        self.w3 = AsyncWeb3(AsyncHTTPProvider(self.wallet.rpc_url, request_kwargs={"timeout": 60}))
+        # Contract construction re-parses the ABI and rebuilds selectors;
+        # do it once and reuse.
+        self._ctf = self.w3.eth.contract(address=CTF_ADDR, abi=FULL_CTF_ABI)
+
+    async def _fetch_tx_params(self, address) -> tuple:
+        """Fetch (nonce, max_fee, priority_fee) in one batched JSON-RPC round-trip.
+
+        Serial pre-send RPCs cost one RTT each on a remote Polygon RPC; a
+        JSON-RPC batch folds them into one POST. Fees are EIP-1559 style
+        from a single eth_feeHistory call: the median 50th-percentile tip
+        of the last 5 blocks, with max fee leaving 2x headroom over the
+        current base fee. chainId is always POLYGON_CHAIN_ID, so no
+        eth_chainId call is needed.
+        """
+        async with self.w3.batch_requests() as batch:
+            batch.add(self.w3.eth.get_transaction_count(address))
+            batch.add(self.w3.eth.fee_history(5, "latest", [50]))
+            nonce, fees = await batch.async_execute()
+
+        base_fee = fees["baseFeePerGas"][-1]
+        tips = sorted(r[0] for r in fees["reward"] if r)
+        # Fall back to the Polygon-spec 30 gwei minimum tip on empty blocks
+        priority_fee = tips[len(tips) // 2] if tips else self.w3.to_wei(30, "gwei")
+        return nonce, base_fee * 2 + priority_fee, priority_fee
+
     async def split_and_sell(
         self, 
         market_id: str, 
@@ -31,35 +71,66 @@ class ExecutionEngine:
         position = position.upper()
         market = await self.gamma.get_market(market_id)
         
-        # 0. Pre-Check Liquidity
         unwanted_token = market.no_token_id if position == "YES" else market.yes_token_id
         unwanted_price = market.no_price if position == "YES" else market.yes_price
-        
-        if not skip_sell:
+
+        # 1. Split (+ concurrent liquidity pre-check)
+        print(f"Executing Split for {market.question[:50]}... (${amount_usd})")
+        if skip_sell:
+            tx_hash = await self._split_position(market.condition_id, amount_usd)
+        else:
+            # The CLOB liquidity check and the split tx have no data
+            # dependency, so run them concurrently - the REST round-trip
+            # hides entirely behind the ~2s block time. The check uses the
+            # sync SDK, hence the to_thread hop.
             print(f"Checking liquidity for {unwanted_token[:8]} to sell ${amount_usd} at ~{unwanted_price:.2f}...")
             clob = ClobClientWrapper(self.wallet.get_unlocked_key(), self.wallet.address)
             # Accept slippage down to 5 cents for the check (we really just want ANY liquidity depth)
-            has_liquidity = clob.check_liquidity(unwanted_token, "sell", amount_usd, 0.05)
-            
-            if not has_liquidity:
+            # return_exceptions=True so a liquidity check that *raises*
+            # (routine against a live CLOB endpoint) can't discard an
+            # already-landed split tx along with its confirmation task.
+            has_liquidity, split_result = await asyncio.gather(
+                asyncio.to_thread(clob.check_liquidity, unwanted_token, "sell", amount_usd, 0.05),
+                self._submit_split(market.condition_id, amount_usd),
+                return_exceptions=True,
+            )
+            if isinstance(split_result, BaseException):
+                # Nothing landed on-chain; the submit itself failed.
+                raise split_result
+            tx_hash, confirm = split_result
+
+            if isinstance(has_liquidity, BaseException) or not has_liquidity:
+                # The split already landed; a raised check is the same as
+                # a failed one — merge straight back rather than sitting
+                # on an unhedged YES+NO pair we can't sell.
+                await confirm
+                if isinstance(has_liquidity, BaseException):
+                    reason = f"Liquidity check failed: {has_liquidity}"
+                else:
+                    reason = f"Insufficient liquidity to sell ${amount_usd}"
+                print(f"{reason}. Merging split back...")
+                merge_tx = await self.merge_positions(market.condition_id, amount_usd)
                 return {
                     "success": False,
-                    "error": f"Insufficient liquidity to sell ${amount_usd}. Aborting Split."
+                    "split_tx": tx_hash,
+                    "merge_tx": merge_tx,
+                    "error": f"{reason}. Split merged back."
                 }
-        
-        # 1. Split
-        print(f"Executing Split for {market.question[:50]}... (${amount_usd})")
-        tx_hash = self._split_position(market.condition_id, amount_usd)
-        
+
         # 2. Sell Unwanted
         clob_order_id = None
         clob_error = None
         
         if not skip_sell:
+            # The sell only needs the tx hash to exist, not the receipt, so
+            # place the CLOB order while the confirmation task polls in the
+            # background; a reverted split still raises via `confirm`.
             print(f"Selling unwanted {unwanted_token[:8]}... at ~{unwanted_price:.2f}")
-            # clob client already initialized above
-            clob_order_id, filled, clob_error = clob.sell_robust(unwanted_token, amount_usd, unwanted_price)
-            
+            (clob_order_id, filled, clob_error), _ = await asyncio.gather(
+                asyncio.to_thread(clob.sell_robust, unwanted_token, amount_usd, unwanted_price),
+                confirm,
+            )
+
         return {
             "success": True,
             "split_tx": tx_hash,
@@ -68,122 +139,125 @@ class ExecutionEngine:
             "wanted_token": market.yes_token_id if position == "YES" else market.no_token_id
         }
 
-    def _split_position(self, condition_id: str, amount_usd: float) -> str:
-        """Internal helper for on-chain split."""
+    async def _confirm_tx(self, tx_hash, action: str) -> None:
+        """Await a receipt and fail loudly if the tx reverted."""
+        # Polygon blocks land every ~2s; the 0.1s default poll just hammers
+        # the RPC with eth_getTransactionReceipt calls.
+        receipt = await self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120, poll_latency=2.0)
+        if receipt["status"] != 1:
+            raise ValueError(f"{action} failed: {tx_hash.hex()}")
+
+    async def _submit_split(self, condition_id: str, amount_usd: float) -> tuple[str, asyncio.Task]:
+        """Submit a split tx and return (tx_hash, confirmation task).
+
+        The receipt wait runs as a background task so callers can overlap
+        other work (e.g. placing the CLOB sell) with the ~2s block time.
+        """
         address = Web3.to_checksum_address(self.wallet.address)
         account = self.w3.eth.account.from_key(self.wallet.get_unlocked_key())
-        
-        ctf = self.w3.eth.contract(
-            address=Web3.to_checksum_address(CONTRACTS["CTF"]),
-            abi=CTF_ABI,
-        )
-        
+
         amount_wei = int(amount_usd * 1e6)
-        condition_bytes = bytes.fromhex(condition_id[2:] if condition_id.startswith("0x") else condition_id)
-        
-        tx = ctf.functions.splitPosition(
-            Web3.to_checksum_address(CONTRACTS["USDC_E"]),
-            bytes(32),
-            condition_bytes,
-            [1, 2],
-            amount_wei,
-        ).build_transaction({
+        condition_bytes = _parse_condition(condition_id)
+        nonce, max_fee, priority_fee = await self._fetch_tx_params(address)
+
+        # Encode calldata locally and assemble the tx dict by hand: with
+        # every field explicit there is no build_transaction machinery left
+        # to fall back to an eth_estimateGas simulation.
+        data = self._ctf.encode_abi(
+            "splitPosition",
+            args=[USDC_ADDR, EMPTY_BYTES32, condition_bytes, [1, 2], amount_wei],
+        )
+        tx = {
             "from": address,
-            "nonce": self.w3.eth.get_transaction_count(address),
+            "to": CTF_ADDR,
+            "data": data,
+            "value": 0,
+            "nonce": nonce,
             "gas": 300000,
-            "gasPrice": self.w3.eth.gas_price,
+            "maxFeePerGas": max_fee,
+            "maxPriorityFeePerGas": priority_fee,
+            "type": 2,
             "chainId": POLYGON_CHAIN_ID,
-        })
-        
+        }
+
         signed = account.sign_transaction(tx)
-        tx_hash = self.w3.eth.send_raw_transaction(signed.raw_transaction)
-        receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
-        
-        if receipt["status"] != 1:
-            raise ValueError(f"Split failed: {tx_hash.hex()}")
-            
-        return tx_hash.hex()
+        tx_hash = await self.w3.eth.send_raw_transaction(signed.raw_transaction)
+        confirm = asyncio.create_task(self._confirm_tx(tx_hash, "Split"))
+        return tx_hash.hex(), confirm
+
+    async def _split_position(self, condition_id: str, amount_usd: float) -> str:
+        """Internal helper for on-chain split (submits and awaits the receipt)."""
+        tx_hash, confirm = await self._submit_split(condition_id, amount_usd)
+        await confirm
+        return tx_hash
 
-    def merge_positions(self, condition_id: str, amount_usd: float) -> str:
+    async def merge_positions(self, condition_id: str, amount_usd: float) -> str:
         """Merge YES and NO tokens back into USDC.e."""
         address = Web3.to_checksum_address(self.wallet.address)
         account = self.w3.eth.account.from_key(self.wallet.get_unlocked_key())
         
-        ctf = self.w3.eth.contract(
-            address=Web3.to_checksum_address(CONTRACTS["CTF"]),
-            abi=CTF_ABI,
-        )
-        
         amount_wei = int(amount_usd * 1e6)
-        condition_bytes = bytes.fromhex(condition_id[2:] if condition_id.startswith("0x") else condition_id)
-        
-        tx = ctf.functions.mergePositions(
-            Web3.to_checksum_address(CONTRACTS["USDC_E"]),
-            bytes(32),
-            condition_bytes,
-            [1, 2],
-            amount_wei,
-        ).build_transaction({
+        condition_bytes = _parse_condition(condition_id)
+        nonce, max_fee, priority_fee = await self._fetch_tx_params(address)
+
+        data = self._ctf.encode_abi(
+            "mergePositions",
+            args=[USDC_ADDR, EMPTY_BYTES32, condition_bytes, [1, 2], amount_wei],
+        )
+        tx = {
             "from": address,
-            "nonce": self.w3.eth.get_transaction_count(address),
+            "to": CTF_ADDR,
+            "data": data,
+            "value": 0,
+            "nonce": nonce,
             "gas": 300000,
-            "gasPrice": self.w3.eth.gas_price,
+            "maxFeePerGas": max_fee,
+            "maxPriorityFeePerGas": priority_fee,
+            "type": 2,
             "chainId": POLYGON_CHAIN_ID,
-        })
+        }
         
         signed = account.sign_transaction(tx)
-        tx_hash = self.w3.eth.send_raw_transaction(signed.raw_transaction)
-        receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+        tx_hash = await self.w3.eth.send_raw_transaction(signed.raw_transaction)
+        # Polygon blocks land every ~2s; the 0.1s default poll just hammers
+        # the RPC with eth_getTransactionReceipt calls.
+        receipt = await self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120, poll_latency=2.0)
         
         if receipt["status"] != 1:
             raise ValueError(f"Merge failed: {tx_hash.hex()}")
             
         return tx_hash.hex()
 
-    def redeem_positions(self, condition_id: str) -> str:
+    async def redeem_positions(self, condition_id: str) -> str:
         """Redeem settled positions for collateral."""
         address = Web3.to_checksum_address(self.wallet.address)
         account = self.w3.eth.account.from_key(self.wallet.get_unlocked_key())
         
-        # We need the redeemPositions ABI
-        REDEMPTION_ABI = [
-            {
-                "inputs": [
-                    {"name": "collateralToken", "type": "address"},
-                    {"name": "parentCollectionId", "type": "bytes32"},
-                    {"name": "conditionId", "type": "bytes32"},
-                    {"name": "indexSets", "type": "uint256[]"},
-                ],
-                "name": "redeemPositions",
-                "outputs": [],
-                "stateMutability": "nonpayable",
-                "type": "function",
-            }
-        ]
-        
-        ctf = self.w3.eth.contract(
-            address=Web3.to_checksum_address(CONTRACTS["CTF"]),
-            abi=CTF_ABI + REDEMPTION_ABI,
+        condition_bytes = _parse_condition(condition_id)
+        nonce, max_fee, priority_fee = await self._fetch_tx_params(address)
+
+        data = self._ctf.encode_abi(
+            "redeemPositions",
+            args=[USDC_ADDR, EMPTY_BYTES32, condition_bytes, [1, 2]],  # YES and NO
         )
-        
-        condition_bytes = bytes.fromhex(condition_id[2:] if condition_id.startswith("0x") else condition_id)
-        
-        tx = ctf.functions.redeemPositions(
-            Web3.to_checksum_address(CONTRACTS["USDC_E"]),
-            bytes(32),
-            condition_bytes,
-            [1, 2], # YES and NO
-        ).build_transaction({
+        tx = {
             "from": address,
-            "nonce": self.w3.eth.get_transaction_count(address),
+            "to": CTF_ADDR,
+            "data": data,
+            "value": 0,
+            "nonce": nonce,
             "gas": 300000,
-            "gasPrice": self.w3.eth.gas_price,
+            "maxFeePerGas": max_fee,
+            "maxPriorityFeePerGas": priority_fee,
+            "type": 2,
             "chainId": POLYGON_CHAIN_ID,
-        })
+        }
         
         signed = account.sign_transaction(tx)
-        tx_hash = self.w3.eth.send_raw_transaction(signed.raw_transaction)
-        receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+        tx_hash = await self.w3.eth.send_raw_transaction(signed.raw_transaction)
+        # Polygon blocks land every ~2s; the 0.1s default poll just hammers
+        # the RPC with eth_getTransactionReceipt calls.
+        receipt = await self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120, poll_latency=2.0)
         
         if receipt["status"] != 1:
             raise ValueError(f"Redeem failed: {tx_hash.hex()}")
@@ -1,16 +1,54 @@
 """Polymarket Gamma API client for market browsing."""
 
-import json
+import asyncio
+import os
+import time
 from dataclasses import dataclass
 from typing import Optional
 
 import httpx
+import numpy as np
+
+# orjson parses the small JSON strings in market payloads several times
+# faster than stdlib json; fall back transparently when it isn't installed.
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
 
 
 GAMMA_API_BASE = "https://gamma-api.polymarket.com"
 
+# Gamma data moves on the order of seconds, while discover_deep and the
+# scripts re-request the same paths many times within one run; a short TTL
+# collapses those repeats into a single round-trip.
+GAMMA_CACHE_TTL = 5.0
+
+# Market metadata (token ids, question text) is effectively static within
+# a scan, so single-market lookups keep a longer TTL: the arbitrage split
+# tables reference the same id as aggregate of one split and component of
+# another, and each should cost one fetch per run.
+GAMMA_MARKET_TTL = 30.0
+
+# Cap on concurrent HTTP requests per client. Unbounded gathers draw
+# 429s and end up slower than the sequential code they replaced; ~16
+# keeps the pipe full without tripping rate limits.
+GAMMA_CONCURRENCY = int(os.getenv("GAMMA_CONCURRENCY", "16"))
+
+# Status codes worth an exponential-backoff retry (throttling/transient).
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_RETRY_ATTEMPTS = 5
+_RETRY_BASE_DELAY = 0.2
+
+
+def _jload(resp: httpx.Response):
+    """Decode a JSON response body (httpx's .json() always uses stdlib json)."""
+    return _loads(resp.content)
 
-@dataclass
+
+# Markets are parsed by the hundred per discover_deep call; slots cut
+# per-instance memory roughly in half and speed up attribute access.
+@dataclass(slots=True)
 class Market:
     """Polymarket market data."""
 
@@ -32,7 +70,7 @@ class Market:
     outcome: Optional[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class MarketGroup:
     """Polymarket event/group containing multiple markets."""
 
@@ -44,7 +82,7 @@ class MarketGroup:
     tags: list[str] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Tag:
     """Polymarket tag data."""
 
@@ -53,26 +91,119 @@ class Tag:
     slug: str
 
 
+# Columnar companion to Market for bulk scans: summing or masking prices
+# across a bracket touches contiguous float arrays instead of walking
+# dataclass instances attribute by attribute.
+@dataclass(slots=True)
+class MarketBatch:
+    """Struct-of-arrays view over a fixed set of markets."""
+
+    ids: np.ndarray
+    yes_token_ids: np.ndarray
+    no_token_ids: np.ndarray
+    yes_prices: np.ndarray
+    no_prices: np.ndarray
+
+
 class GammaClient:
     """HTTP client for Polymarket Gamma API."""
 
     def __init__(self, timeout: float = 30.0):
         self.timeout = timeout
+        self._client: httpx.AsyncClient | None = None
+        # (path, sorted params) -> (fetch time, decoded body)
+        self._cache: dict[tuple, tuple[float, object]] = {}
+        # key -> in-flight fetch task (singleflight: concurrent callers
+        # of the same key share one request instead of stampeding)
+        self._inflight: dict[tuple, asyncio.Task] = {}
+        self._sem = asyncio.Semaphore(GAMMA_CONCURRENCY)
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Get or create the shared async client.
+
+        One long-lived client reuses keep-alive connections to the Gamma
+        API instead of paying a fresh TCP+TLS handshake per call.
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=64,
+                    max_keepalive_connections=32,
+                    keepalive_expiry=30.0,
+                ),
+            )
+        return self._client
+
+    async def _get_json(self, path: str, params: dict | None = None, ttl: float = GAMMA_CACHE_TTL):
+        """GET a Gamma path with a ttl-second response cache.
+
+        Concurrent requests for the same key are collapsed onto a single
+        in-flight fetch, so gather'd fan-outs that touch overlapping
+        markets pay one round-trip instead of stampeding the API.
+        """
+        key = (path, tuple(sorted(params.items())) if params else None)
+        cached = self._cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < ttl:
+            return cached[1]
+
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._fetch_json(key, path, params))
+            self._inflight[key] = inflight
+            inflight.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await inflight
+
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Issue one HTTP request under the concurrency cap, retrying
+        throttling and transient server errors with exponential backoff."""
+        async with self._sem:
+            http = await self._get_client()
+            for attempt in range(_RETRY_ATTEMPTS):
+                try:
+                    resp = await http.request(method, url, **kwargs)
+                    resp.raise_for_status()
+                    return resp
+                except httpx.HTTPStatusError as e:
+                    if (
+                        e.response.status_code in _RETRY_STATUSES
+                        and attempt < _RETRY_ATTEMPTS - 1
+                    ):
+                        await asyncio.sleep(_RETRY_BASE_DELAY * 2**attempt)
+                        continue
+                    raise
+
+    async def _fetch_json(self, key: tuple, path: str, params: dict | None):
+        resp = await self._request("GET", f"{GAMMA_API_BASE}{path}", params=params)
+        data = _jload(resp)
+        self._cache[key] = (time.monotonic(), data)
+        return data
+
+    async def close(self) -> None:
+        """Close the HTTP client."""
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self) -> "GammaClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
 
     async def get_trending_markets(self, limit: int = 20) -> list[Market]:
         """Get trending markets by volume."""
-        async with httpx.AsyncClient(timeout=self.timeout) as http:
-            resp = await http.get(
-                f"{GAMMA_API_BASE}/markets",
-                params={
-                    "closed": "false",
-                    "limit": limit,
-                    "order": "volume24hr",
-                    "ascending": "false",
-                },
-            )
-            resp.raise_for_status()
-            return [self._parse_market(m) for m in resp.json()]
+        data = await self._get_json(
+            "/markets",
+            params={
+                "closed": "false",
+                "limit": limit,
+                "order": "volume24hr",
+                "ascending": "false",
+            },
+        )
+        return [self._parse_market(m) for m in data]
 
     async def public_search(
         self, query: str, limit_per_type: int = 10
@@ -81,18 +212,15 @@ class GammaClient:
 
         Returns a dict with 'events', 'tags', and 'profiles' keys.
         """
-        async with httpx.AsyncClient(timeout=self.timeout) as http:
-            resp = await http.get(
-                f"{GAMMA_API_BASE}/public-search",
-                params={
-                    "q": query,
-                    "limit_per_type": limit_per_type,
-                    "search_tags": "true",
-                    "search_profiles": "true",
-                },
-            )
-            resp.raise_for_status()
-            return resp.json()
+        return await self._get_json(
+            "/public-search",
+            params={
+                "q": query,
+                "limit_per_type": limit_per_type,
+                "search_tags": "true",
+                "search_profiles": "true",
+            },
+        )
 
     async def search_markets(self, query: str, limit: int = 20) -> list[Market]:
         """Search markets by keyword using system search.
@@ -114,28 +242,24 @@ class GammaClient:
 
     async def get_tag_markets(self, tag_slug: str, limit: int = 50) -> list[Market]:
         """Get markets associated with a specific tag."""
-        async with httpx.AsyncClient(timeout=self.timeout) as http:
-            resp = await http.get(
-                f"{GAMMA_API_BASE}/markets",
-                params={
-                    "tag_slug": tag_slug,
-                    "closed": "false",
-                    "limit": limit,
-                    "active": "true",
-                },
-            )
-            resp.raise_for_status()
-            return [self._parse_market(m) for m in resp.json()]
+        data = await self._get_json(
+            "/markets",
+            params={
+                "tag_slug": tag_slug,
+                "closed": "false",
+                "limit": limit,
+                "active": "true",
+            },
+        )
+        return [self._parse_market(m) for m in data]
 
     async def get_related_tags(self, tag_slug: str) -> list[Tag]:
         """Get tags related to a specific tag slug."""
-        async with httpx.AsyncClient(timeout=self.timeout) as http:
-            resp = await http.get(f"{GAMMA_API_BASE}/tags/slug/{tag_slug}/related-tags/tags")
-            resp.raise_for_status()
-            return [
-                Tag(id=str(t.get("id", "")), label=t.get("label", ""), slug=t.get("slug", ""))
-                for t in resp.json()
-            ]
+        data = await self._get_json(f"/tags/slug/{tag_slug}/related-tags/tags")
+        return [
+            Tag(id=str(t.get("id", "")), label=t.get("label", ""), slug=t.get("slug", ""))
+            for t in data
+        ]
 
     async def discover_deep(self, query: str, max_depth: int = 1) -> list[Market]:
         """
@@ -146,7 +270,10 @@ class GammaClient:
         """
         # 1. Search for initial "seed"
         search_data = await self.public_search(query, limit_per_type=10)
-        found_markets = []
+        # Dedupe by condition id at insertion: tags overlap heavily, and
+        # skipping already-seen markets up front avoids re-parsing their
+        # JSON and a separate dedupe pass at the end.
+        unique_markets: dict[str, Market] = {}
         processed_event_ids = set()
         processed_tag_slugs = set()
 
@@ -160,7 +287,9 @@ class GammaClient:
             # Vertical: Get all markets in this event
             event_markets = event_data.get("markets", [])
             for m in event_markets:
-                found_markets.append(self._parse_market(m))
+                condition_id = m.get("conditionId", "")
+                if condition_id not in unique_markets:
+                    unique_markets[condition_id] = self._parse_market(m)
 
             # Horizontal: Track tags for further expansion
             tags = event_data.get("tags", [])
@@ -170,113 +299,204 @@ class GammaClient:
                     processed_tag_slugs.add(tag_slug)
 
         # 3. Horizontal Expansion (Depth 1)
-        if max_depth >= 1:
-            for tag_slug in list(processed_tag_slugs):
-                # Get related tags
-                try:
-                    related_tags = await self.get_related_tags(tag_slug)
-                    for rt in related_tags:
-                        if rt.slug not in processed_tag_slugs:
-                            # Fetch markets from related tags
-                            tag_markets = await self.get_tag_markets(rt.slug, limit=10)
-                            found_markets.extend(tag_markets)
-                            processed_tag_slugs.add(rt.slug)
-                except Exception:
-                    continue
+        # Tag lookups are independent I/O, so fan them out concurrently
+        # instead of paying one round-trip per tag. The semaphore keeps us
+        # under the Gamma rate limit; failed lookups are skipped just like
+        # the old per-tag try/except did.
+        if max_depth >= 1 and processed_tag_slugs:
+            semaphore = asyncio.Semaphore(16)
+
+            async def _bounded(coro):
+                async with semaphore:
+                    return await coro
+
+            related_results = await asyncio.gather(
+                *[_bounded(self.get_related_tags(s)) for s in processed_tag_slugs],
+                return_exceptions=True,
+            )
 
-        # Deduplicate by condition_id
-        unique_markets = {}
-        for m in found_markets:
-            if m.condition_id not in unique_markets:
-                unique_markets[m.condition_id] = m
+            new_slugs = []
+            for related_tags in related_results:
+                if isinstance(related_tags, Exception):
+                    continue
+                for rt in related_tags:
+                    if rt.slug not in processed_tag_slugs:
+                        processed_tag_slugs.add(rt.slug)
+                        new_slugs.append(rt.slug)
+
+            market_results = await asyncio.gather(
+                *[_bounded(self.get_tag_markets(s, limit=10)) for s in new_slugs],
+                return_exceptions=True,
+            )
+            for tag_markets in market_results:
+                if isinstance(tag_markets, Exception):
+                    continue
+                for m in tag_markets:
+                    if m.condition_id not in unique_markets:
+                        unique_markets[m.condition_id] = m
 
         return list(unique_markets.values())
 
     async def get_markets_by_event(self, event_id: str) -> list[Market]:
         """Get all markets belonging to a specific event ID."""
-        async with httpx.AsyncClient(timeout=self.timeout) as http:
-            resp = await http.get(
-                f"{GAMMA_API_BASE}/markets",
-                params={"event_id": event_id},
-            )
-            resp.raise_for_status()
-            return [self._parse_market(m) for m in resp.json()]
+        data = await self._get_json("/markets", params={"event_id": event_id})
+        return [self._parse_market(m) for m in data]
 
     async def get_market(self, market_id: str) -> Market:
         """Get market by ID."""
-        async with httpx.AsyncClient(timeout=self.timeout) as http:
-            resp = await http.get(f"{GAMMA_API_BASE}/markets/{market_id}")
-            resp.raise_for_status()
-            return self._parse_market(resp.json())
+        data = await self._get_json(f"/markets/{market_id}", ttl=GAMMA_MARKET_TTL)
+        return self._parse_market(data)
 
     async def get_market_by_slug(self, slug: str) -> Market:
         """Get market by slug."""
-        async with httpx.AsyncClient(timeout=self.timeout) as http:
-            resp = await http.get(
-                f"{GAMMA_API_BASE}/markets",
-                params={"slug": slug},
-            )
-            resp.raise_for_status()
-            markets = resp.json()
-            if not markets:
-                raise ValueError(f"Market not found: {slug}")
-            return self._parse_market(markets[0])
+        markets = await self._get_json("/markets", params={"slug": slug})
+        if not markets:
+            raise ValueError(f"Market not found: {slug}")
+        return self._parse_market(markets[0])
 
     async def get_events(self, limit: int = 20) -> list[MarketGroup]:
         """Get events/groups with their markets."""
-        async with httpx.AsyncClient(timeout=self.timeout) as http:
-            resp = await http.get(
-                f"{GAMMA_API_BASE}/events",
-                params={
-                    "closed": "false",
-                    "limit": limit,
-                    "order": "volume24hr",
-                    "ascending": "false",
-                },
-            )
-            resp.raise_for_status()
-            return [self._parse_event(e) for e in resp.json()]
+        data = await self._get_json(
+            "/events",
+            params={
+                "closed": "false",
+                "limit": limit,
+                "order": "volume24hr",
+                "ascending": "false",
+            },
+        )
+        return [self._parse_event(e) for e in data]
+
+    async def get_markets_bulk(self, market_ids: list[str], side: str = "BUY") -> MarketBatch:
+        """Fetch a fixed set of markets as columnar arrays.
+
+        One concurrent metadata gather plus a single bulk price call,
+        with fresh CLOB prices overlaying the cached Gamma quotes where
+        available. Scans over brackets can then reduce whole columns
+        (e.g. ``batch.yes_prices.sum()``) in one vectorized operation.
+        """
+        markets = await asyncio.gather(*(self.get_market(mid) for mid in market_ids))
+
+        all_token_ids = [m.yes_token_id for m in markets if m.yes_token_id]
+        all_token_ids += [m.no_token_id for m in markets if m.no_token_id]
+        prices = await self.get_prices(all_token_ids, side=side)
+
+        n = len(markets)
+        ids = np.empty(n, dtype=object)
+        yes_token_ids = np.empty(n, dtype=object)
+        no_token_ids = np.empty(n, dtype=object)
+        yes_prices = np.empty(n, dtype=np.float64)
+        no_prices = np.empty(n, dtype=np.float64)
+
+        for i, m in enumerate(markets):
+            ids[i] = m.id
+            yes_token_ids[i] = m.yes_token_id
+            no_token_ids[i] = m.no_token_id or ""
+            yes_prices[i] = prices.get(m.yes_token_id, m.yes_price)
+            no_prices[i] = prices.get(m.no_token_id, m.no_price)
+
+        return MarketBatch(
+            ids=ids,
+            yes_token_ids=yes_token_ids,
+            no_token_ids=no_token_ids,
+            yes_prices=yes_prices,
+            no_prices=no_prices,
+        )
 
     async def get_prices(self, token_ids: list[str], side: str = "BUY") -> dict[str, float]:
-        """Get current prices for token IDs using bulk POST endpoint."""
+        """Get current prices for token IDs using bulk POST endpoint.
+
+        Prices are never TTL-cached (callers rely on them being fresh),
+        but identical concurrent requests share one in-flight fetch.
+        """
         if not token_ids:
             return {}
 
+        key = ("/prices", tuple(sorted(token_ids)), side)
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._fetch_prices(token_ids, side))
+            self._inflight[key] = inflight
+            inflight.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await inflight
+
+    async def _fetch_prices(self, token_ids: list[str], side: str) -> dict[str, float]:
         headers = {"Content-Type": "application/json", "Accept": "application/json"}
         payload = [{"token_id": tid, "side": side} for tid in token_ids]
-        
-        async with httpx.AsyncClient(timeout=self.timeout, headers=headers) as http:
-            resp = await http.post(
-                "https://clob.polymarket.com/prices",
-                json=payload,
-            )
-            resp.raise_for_status()
-            results = resp.json()
-            # Flatten the response structure: {tid: {side: price}} -> {tid: price}
-            return {tid: float(data.get(side, 0)) for tid, data in results.items()}
+
+        resp = await self._request(
+            "POST",
+            "https://clob.polymarket.com/prices",
+            json=payload,
+            headers=headers,
+        )
+        results = _jload(resp)
+        # Flatten the response structure: {tid: {side: price}} -> {tid: price}
+        return {tid: float(data.get(side, 0)) for tid, data in results.items()}
+
+    def parse_markets_soa(self, data_list: list[dict]) -> dict[str, np.ndarray]:
+        """Parse raw market JSON into columnar arrays for vectorized filtering.
+
+        Structure-of-arrays companion to _parse_market: screens that only
+        need prices/volume to narrow thousands of markets can apply boolean
+        masks over contiguous float columns instead of walking Market
+        objects row by row, and parse full Markets only for survivors.
+        """
+        n = len(data_list)
+        yes_prices = np.empty(n, dtype=np.float64)
+        no_prices = np.empty(n, dtype=np.float64)
+        volumes_24h = np.empty(n, dtype=np.float64)
+        liquidity = np.empty(n, dtype=np.float64)
+        tradeable = np.empty(n, dtype=bool)
+        ids = np.empty(n, dtype=object)
+        questions = np.empty(n, dtype=object)
+
+        for i, data in enumerate(data_list):
+            get = data.get
+            prices = _loads(get("outcomePrices", "[0.5, 0.5]"))
+            yes_prices[i] = float(prices[0]) if prices else 0.5
+            no_prices[i] = float(prices[1]) if len(prices) > 1 else 0.5
+            volumes_24h[i] = float(get("volume24hr") or 0)
+            liquidity[i] = float(get("liquidity") or 0)
+            tradeable[i] = not get("closed", False) and not get("resolved", False)
+            ids[i] = get("id", "")
+            questions[i] = get("question", "")
+
+        return {
+            "id": ids,
+            "question": questions,
+            "yes_price": yes_prices,
+            "no_price": no_prices,
+            "volume_24h": volumes_24h,
+            "liquidity": liquidity,
+            "tradeable": tradeable,
+        }
 
     def _parse_market(self, data: dict) -> Market:
         """Parse market JSON into Market dataclass."""
-        clob_tokens = json.loads(data.get("clobTokenIds", "[]"))
-        prices = json.loads(data.get("outcomePrices", "[0.5, 0.5]"))
+        # Bind the bound method once; this runs ~17 lookups per market and
+        # markets arrive by the hundred.
+        get = data.get
+        clob_tokens = _loads(get("clobTokenIds", "[]"))
+        prices = _loads(get("outcomePrices", "[0.5, 0.5]"))
 
         return Market(
-            id=data.get("id", ""),
-            question=data.get("question", ""),
-            slug=data.get("slug", ""),
-            condition_id=data.get("conditionId", ""),
+            id=get("id", ""),
+            question=get("question", ""),
+            slug=get("slug", ""),
+            condition_id=get("conditionId", ""),
             yes_token_id=clob_tokens[0] if clob_tokens else "",
             no_token_id=clob_tokens[1] if len(clob_tokens) > 1 else None,
             yes_price=float(prices[0]) if prices else 0.5,
             no_price=float(prices[1]) if len(prices) > 1 else 0.5,
-            volume=float(data.get("volume", 0) or 0),
-            volume_24h=float(data.get("volume24hr", 0) or 0),
-            liquidity=float(data.get("liquidity", 0) or 0),
-            end_date=data.get("endDate", ""),
-            active=data.get("active", True),
-            closed=data.get("closed", False),
-            resolved=data.get("resolved", False),
-            outcome=data.get("outcome"),
+            volume=float(get("volume") or 0),
+            volume_24h=float(get("volume24hr") or 0),
+            liquidity=float(get("liquidity") or 0),
+            end_date=get("endDate", ""),
+            active=get("active", True),
+            closed=get("closed", False),
+            resolved=get("resolved", False),
+            outcome=get("outcome"),
         )
 
     def _parse_event(self, data: dict) -> MarketGroup:
@@ -5,7 +5,9 @@ Used for extracting logical implications between markets.
 """
 
 import asyncio
+import json
 import os
+import random
 
 import httpx
 
@@ -64,8 +66,17 @@ class LLMClient:
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create async client."""
         if self._client is None or self._client.is_closed:
+            # HTTP/2 multiplexes concurrent completions over one TLS
+            # session to openrouter.ai instead of opening a connection
+            # per request under gather bursts.
             self._client = httpx.AsyncClient(
                 timeout=self.timeout,
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=64,
+                    max_keepalive_connections=32,
+                    keepalive_expiry=30.0,
+                ),
                 headers={
                     "Authorization": f"Bearer {self.api_key}",
                     "Content-Type": "application/json",
@@ -112,20 +123,81 @@ class LLMClient:
 
             except httpx.HTTPStatusError as e:
                 if e.response.status_code == 429:
-                    # Rate limited, wait and retry
-                    wait_time = 2**attempt
+                    # Rate limited: honor the server's Retry-After when
+                    # given, otherwise back off exponentially. Jitter either
+                    # way so gather'd requests don't retry in lockstep.
+                    retry_after = e.response.headers.get("Retry-After")
+                    try:
+                        wait_time = float(retry_after) + random.uniform(0, 0.5)
+                    except (TypeError, ValueError):
+                        wait_time = min(2**attempt, 30) * (0.5 + random.random())
                     await asyncio.sleep(wait_time)
                     continue
                 raise
 
             except httpx.RequestError:
                 if attempt < LLM_MAX_RETRIES - 1:
-                    await asyncio.sleep(1)
+                    await asyncio.sleep(min(2**attempt, 30) * (0.5 + random.random()))
                     continue
                 raise
 
         raise RuntimeError(f"Failed after {LLM_MAX_RETRIES} attempts")
 
+    async def stream(
+        self,
+        messages: list[dict],
+        temperature: float = 0.1,
+        max_tokens: int | None = None,
+    ):
+        """
+        Stream a chat completion as an async iterator of content deltas.
+
+        Callers can start consuming output while the model is still
+        generating, and closing the iterator early aborts the request
+        (e.g. once a complete JSON block has arrived).
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            temperature: Sampling temperature (0.0-1.0)
+            max_tokens: Maximum tokens in response
+
+        Yields:
+            Content delta strings as the provider emits them
+        """
+        client = await self._get_client()
+
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "stream": True,
+        }
+        if max_tokens:
+            payload["max_tokens"] = max_tokens
+
+        async with client.stream(
+            "POST",
+            f"{self.base_url}/chat/completions",
+            json=payload,
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+                data = line[6:]
+                if data == "[DONE]":
+                    break
+                try:
+                    chunk = json.loads(data)
+                except ValueError:
+                    continue
+                choices = chunk.get("choices")
+                if not choices:
+                    continue
+                delta = choices[0].get("delta", {}).get("content")
+                if delta:
+                    yield delta
+
     async def close(self) -> None:
         """Close the HTTP client."""
         if self._client:
@@ -143,12 +215,15 @@ class LLMClient:
 # SINGLETON ACCESS
 # =============================================================================
 
-_llm_client: LLMClient | None = None
+# One client per model: a single mutable singleton let concurrent tasks
+# asking for different models clobber each other's connection pool
+# mid-flight.
+_llm_clients: dict[str, LLMClient] = {}
 
 
 def get_llm_client(model: str = DEFAULT_MODEL) -> LLMClient:
     """
-    Get LLM client singleton.
+    Get the shared LLM client for a model.
 
     Args:
         model: Model identifier from OpenRouter
@@ -156,17 +231,15 @@ def get_llm_client(model: str = DEFAULT_MODEL) -> LLMClient:
     Returns:
         LLMClient instance
     """
-    global _llm_client
-
-    if _llm_client is None or _llm_client.model != model:
-        _llm_client = LLMClient(model=model)
-
-    return _llm_client
+    client = _llm_clients.get(model)
+    if client is None:
+        client = _llm_clients[model] = LLMClient(model=model)
+    return client
 
 
 async def close_llm_client() -> None:
-    """Close the LLM client connection."""
-    global _llm_client
-    if _llm_client:
-        await _llm_client.close()
-        _llm_client = None
+    """Close every shared LLM client connection."""
+    clients = list(_llm_clients.values())
+    _llm_clients.clear()
+    for client in clients:
+        await client.close()
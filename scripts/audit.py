@@ -31,55 +31,68 @@ async def run_audit():
     address = client.get_address()
     print(f"--- POLYMARKET AUDIT: {address} ---")
     
+    # Balance, positions and trades are independent lookups; fetch them
+    # concurrently (sync SDK calls via to_thread) and keep the per-section
+    # error handling on the results.
+    async def _fetch_positions():
+        async with httpx.AsyncClient() as http:
+            return await http.get(f"{DATA_API}/positions", params={"user": address})
+
+    bal, resp, trades = await asyncio.gather(
+        asyncio.to_thread(client.get_balance_allowance),
+        _fetch_positions(),
+        asyncio.to_thread(client.get_trades),
+        return_exceptions=True,
+    )
+
     # 1. Balance
     print("\n[BALANCE]")
-    try:
-        bal = client.get_balance_allowance()
+    if isinstance(bal, Exception):
+        print(f"  Error: {bal}")
+    else:
         balance = bal.get("balance", "0") if isinstance(bal, dict) else getattr(bal, "balance", "0")
         allowance = bal.get("allowance", "0") if isinstance(bal, dict) else getattr(bal, "allowance", "0")
         print(f"  USDC: {balance:<10} | Allowance: {allowance}")
-    except Exception as e:
-        print(f"  Error: {e}")
 
     # 2. Positions
     print("\n[POSITIONS]")
-    async with httpx.AsyncClient() as http:
-        try:
-            resp = await http.get(f"{DATA_API}/positions", params={"user": address})
-            if resp.status_code == 200:
-                pos_list = resp.json()
-                if not pos_list:
-                    print("  No active positions.")
-                else:
-                    print(f"  {'Outcome':<8} | {'Size':<8} | {'Avg Px':<8} | {'Cur Px':<8} | {'Question'}")
-                    print(f"  " + "-" * 100)
-                    for p in pos_list:
-                        sz = float(p.get("size", 0))
-                        if sz > 0.1:
-                            print(f"  {p.get('outcome'):<8} | {sz:<8.1f} | {p.get('avgPrice'):<8.3f} | {p.get('curPrice'):<8.3f} | {p.get('title')[:60]}")
-            else:
-                print(f"  Data API Error: {resp.status_code}")
-        except Exception as e:
-            print(f"  Data API Exception: {e}")
+    if isinstance(resp, Exception):
+        print(f"  Data API Exception: {resp}")
+    elif resp.status_code != 200:
+        print(f"  Data API Error: {resp.status_code}")
+    else:
+        pos_list = resp.json()
+        if not pos_list:
+            print("  No active positions.")
+        else:
+            print(f"  {'Outcome':<8} | {'Size':<8} | {'Avg Px':<8} | {'Cur Px':<8} | {'Question'}")
+            print(f"  " + "-" * 100)
+            for p in pos_list:
+                sz = float(p.get("size", 0))
+                if sz > 0.1:
+                    print(f"  {p.get('outcome'):<8} | {sz:<8.1f} | {p.get('avgPrice'):<8.3f} | {p.get('curPrice'):<8.3f} | {p.get('title')[:60]}")
 
     # 3. Recent Trades
     print("\n[RECENT TRADES]")
-    try:
-        trades = client.get_trades()
-        if not trades:
-            print("  No recent trades found.")
-        else:
-            print(f"  {'Time':<20} | {'Side':<5} | {'Size':<8} | {'Price':<8}")
-            print(f"  " + "-" * 50)
-            for t in trades[:5]:
-                t_ts = t.get("timestamp") if isinstance(t, dict) else getattr(t, "timestamp", 0)
-                side = t.get("side") if isinstance(t, dict) else getattr(t, "side", "?")
-                size = t.get("size") if isinstance(t, dict) else getattr(t, "size", "?")
-                price = t.get("price") if isinstance(t, dict) else getattr(t, "price", "?")
-                t_str = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(float(t_ts))) if t_ts else "Unknown"
-                print(f"  {t_str:<20} | {side:<5} | {size:<8} | {price:<8}")
-    except Exception as e:
-        print(f"  Error: {e}")
+    if isinstance(trades, Exception):
+        print(f"  Error: {trades}")
+    elif not trades:
+        print("  No recent trades found.")
+    else:
+        print(f"  {'Time':<20} | {'Side':<5} | {'Size':<8} | {'Price':<8}")
+        print(f"  " + "-" * 50)
+        for t in trades[:5]:
+            t_ts = t.get("timestamp") if isinstance(t, dict) else getattr(t, "timestamp", 0)
+            side = t.get("side") if isinstance(t, dict) else getattr(t, "side", "?")
+            size = t.get("size") if isinstance(t, dict) else getattr(t, "size", "?")
+            price = t.get("price") if isinstance(t, dict) else getattr(t, "price", "?")
+            t_str = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(float(t_ts))) if t_ts else "Unknown"
+            print(f"  {t_str:<20} | {side:<5} | {size:<8} | {price:<8}")
 
-if __name__ == "__main__":
+def main():
     asyncio.run(run_audit())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
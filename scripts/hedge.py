@@ -11,8 +11,14 @@ import os
 import sys
 import json
 import re
+import time
 import asyncio
+import hashlib
 import argparse
+import numpy as np
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from functools import lru_cache
 from pathlib import Path
 
 # Add parent to path for lib imports
@@ -22,13 +28,25 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from dotenv import load_dotenv
 load_dotenv(Path(__file__).parent.parent / ".env")
 
+# Optional fast event loop (perf extra): libuv-backed awaits cost a
+# fraction of the selector loop's, which compounds across the
+# gather'd Gamma + LLM request fan-outs.
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
 from lib.gamma_client import GammaClient, Market
+from lib.position_storage import get_storage_dir
 from lib.llm_client import LLMClient, DEFAULT_MODEL,OPENROUTER_BASE_URL
 from lib.coverage import (
     NECESSARY_PROBABILITY,
-    build_portfolio,
-    filter_portfolios_by_tier,
+    Portfolio,
+    build_portfolios_batch,
+    portfolio_profit_pct,
     filter_portfolios_by_coverage,
+    filter_sort_portfolios_batch,
     sort_portfolios,
 )
 
@@ -37,14 +55,17 @@ from lib.coverage import (
 # IMPLICATION PROMPT
 # =============================================================================
 
+# The market list leads the prompt and the target follows: providers
+# cache shared prompt prefixes, so keeping the (near-)invariant list up
+# front lets repeated calls in one scan reuse the cached prefix.
 IMPLICATION_PROMPT = """Find ONLY logically necessary relationships between prediction market events.
 
-## TARGET EVENT:
-"{target_question}"
-
 ## AVAILABLE EVENTS:
 {market_list_text}
 
+## TARGET EVENT:
+"{target_question}"
+
 ## WHAT IS "NECESSARY"?
 
 A **NECESSARY** implication (A -> B) means: "If A is true, B MUST be true BY DEFINITION OR PHYSICAL LAW."
@@ -117,10 +138,95 @@ For EACH relationship, you MUST:
 """
 
 
+IMPLICATION_BATCH_PROMPT = """Find ONLY logically necessary relationships between prediction market events.
+
+## AVAILABLE EVENTS:
+{market_list_text}
+
+## TARGET EVENTS:
+{targets_list_text}
+
+## WHAT IS "NECESSARY"?
+
+A **NECESSARY** implication (A -> B) means: "If A is true, B MUST be true BY DEFINITION OR PHYSICAL LAW."
+
+There must be ZERO possible scenarios where A=YES and B=NO. Not "unlikely" - IMPOSSIBLE.
+
+## VALID NECESSARY RELATIONSHIPS (include these):
+- "election held" -> "election called" (DEFINITION: can't hold without calling)
+- "city captured" -> "military operation in city" (PHYSICAL: can't capture without entering)
+- "person dies" -> "person was alive" (LOGICAL: death requires prior life)
+
+## NOT NECESSARY - DO NOT INCLUDE:
+- "war started" -> "peace talks failed" (WRONG: war can start without talks)
+- "election called" -> "election held" (WRONG: can be cancelled)
+- "ceasefire broken" -> "war escalates" (WRONG: could de-escalate)
+- "candidate wins primary" -> "candidate wins general" (WRONG: can lose general)
+- **MUTUALLY EXCLUSIVE** events are NOT implications of YES (A=YES => B=NO is not A=YES => B=YES)
+- **STRADDLES**: same topic is NOT an implication
+
+## YOUR TASK
+
+For EACH target event, find ONLY relationships true BY DEFINITION:
+1. implied_by (OTHER -> TARGET): "If OTHER=YES, then TARGET=YES is 100% CERTAIN"
+2. implies (TARGET -> OTHER): "If TARGET=YES, then OTHER=YES is 100% CERTAIN"
+
+For EACH relationship, try to construct a counterexample scenario first.
+If ANY such scenario is imaginable (even unlikely), DO NOT INCLUDE IT.
+
+## OUTPUT FORMAT (JSON only, one entry per target, empty lists are fine):
+```json
+{{
+  "results": [
+    {{
+      "target_id": "exact target id from list",
+      "implied_by": [
+        {{
+          "market_id": "exact id from list",
+          "market_question": "exact question from list",
+          "explanation": "why other=YES makes target=YES logically certain",
+          "counterexample_attempt": "I tried to imagine [scenario] but it's impossible because [reason]"
+        }}
+      ],
+      "implies": [
+        {{
+          "market_id": "exact id from list",
+          "market_question": "exact question from list",
+          "explanation": "why target=YES makes other=YES logically certain",
+          "counterexample_attempt": "I tried to imagine [scenario] but it's impossible because [reason]"
+        }}
+      ]
+    }}
+  ]
+}}
+```
+
+## CRITICAL RULES:
+1. QUALITY OVER QUANTITY - empty lists are fine, false positives are NOT
+2. "Likely" or "usually" means DO NOT INCLUDE
+3. Correlations are NOT implications - "A often leads to B" is NOT "A guarantees B"
+4. Political/social predictions are almost NEVER necessary (humans are unpredictable)
+5. When in doubt, LEAVE IT OUT
+"""
+
+# Targets grouped into one LLM call; small enough that the model keeps
+# the JSON schema, large enough to amortize the repeated market list.
+BATCH_TARGETS_PER_CALL = 8
+
+
 # =============================================================================
 # JSON EXTRACTION
 # =============================================================================
 
+# Optional fast path: orjson parses large LLM outputs ~2-5x faster than
+# the stdlib; both raise a ValueError subclass on malformed input.
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
+_JSON_OBJ_RE = re.compile(r"\{[\s\S]*\}")
+
 
 def extract_json_from_response(text: str) -> dict | None:
     """
@@ -133,40 +239,186 @@ def extract_json_from_response(text: str) -> dict | None:
     """
     text = text.strip()
 
-    # Remove markdown code blocks
-    if "```json" in text:
-        text = text.split("```json")[1]
-    if "```" in text:
-        text = text.split("```")[0]
+    # Remove markdown code blocks (partition avoids split's list allocs)
+    _, _, rest = text.partition("```json")
+    if rest:
+        text = rest
+    head, fence, _ = text.partition("```")
+    if fence:
+        text = head
     text = text.strip()
 
     # Try direct parse
     try:
-        return json.loads(text)
-    except json.JSONDecodeError:
+        return _loads(text)
+    except ValueError:
         pass
 
     # Try to find JSON object in text
-    match = re.search(r"\{[\s\S]*\}", text)
+    match = _JSON_OBJ_RE.search(text)
     if match:
         try:
-            return json.loads(match.group())
-        except json.JSONDecodeError:
+            return _loads(match.group())
+        except ValueError:
             pass
 
     return None
 
 
+async def _stream_response(llm: LLMClient, prompt: str, temperature: float = 0.1) -> str:
+    """Accumulate a streamed completion into a string.
+
+    Streaming means parsing can start the moment the model stops
+    emitting JSON: once a fenced block has closed, the remaining deltas
+    are trailing prose and the stream is abandoned early.
+    """
+    buf = ""
+    async for delta in llm.stream(
+        [{"role": "user", "content": prompt}], temperature=temperature
+    ):
+        buf += delta
+        start = buf.find("```json")
+        if start != -1 and buf.find("```", start + 7) != -1:
+            break
+    return buf
+
+
+# =============================================================================
+# LLM RESULT CACHE
+# =============================================================================
+
+# Implications between a fixed set of markets don't change between scans,
+# so repeat scans of the same trending set can skip the LLM round-trip
+# entirely. Results live as one JSON file per key under the PolyClaw
+# storage dir; prices are NOT cached (covers are re-derived every scan).
+LLM_CACHE_TTL = 3600.0
+_LLM_CACHE_VERSION = "v1"  # bump when the prompts change
+
+
+def _llm_cache_dir() -> Path:
+    cache_dir = get_storage_dir() / "llm_cache"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
+def _llm_cache_key(target_id: str, other_ids: list[str]) -> str:
+    raw = "|".join((_LLM_CACHE_VERSION, target_id, *other_ids))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _llm_cache_get(key: str) -> dict | None:
+    """Return the cached LLM result for key, or None if absent/expired."""
+    path = _llm_cache_dir() / f"{key}.json"
+    try:
+        payload = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+    if time.time() - payload.get("ts", 0) > LLM_CACHE_TTL:
+        return None
+    return payload.get("result")
+
+
+def _llm_cache_set(key: str, result: dict) -> None:
+    """Persist an LLM result; atomic write, best-effort on errors."""
+    path = _llm_cache_dir() / f"{key}.json"
+    temp = path.with_suffix(".tmp")
+    try:
+        temp.write_text(json.dumps({"ts": time.time(), "result": result}))
+        temp.replace(path)
+    except OSError:
+        pass
+
+
 # =============================================================================
 # IMPLICATION EXTRACTION
 # =============================================================================
 
 
+def build_token_index(markets: list[Market]) -> dict[str, set[str]]:
+    """Map each lowercase question token to the ids of markets containing it."""
+    index: dict[str, set[str]] = defaultdict(set)
+    for m in markets:
+        for token in m.question.lower().split():
+            index[token].add(m.id)
+    return index
+
+
+@dataclass(slots=True)
+class MarketLookups:
+    """Per-scan lookup tables, built once and shared across all targets."""
+
+    lines: dict[str, str]
+    by_id: dict[str, "Market"]
+    by_question: dict[str, "Market"]
+    token_index: dict[str, set[str]]
+    token_sets: dict[str, set[str]]
+
+
+def build_market_lookups(markets: list[Market]) -> MarketLookups:
+    """Build every lookup table one scan needs in a single pass setup.
+
+    derive_covers_from_implications used to rebuild the id and question
+    dicts on every call - N times per scan over the same market list.
+    """
+    return MarketLookups(
+        lines=build_market_lines(markets),
+        by_id={m.id: m for m in markets},
+        by_question={m.question.lower().strip(): m for m in markets},
+        token_index=build_token_index(markets),
+        token_sets={m.id: set(m.question.lower().split()) for m in markets},
+    )
+
+
+# Minimum edge a cover must leave for a pairing to be worth analyzing
+MIN_HEDGE_EDGE = 0.01
+
+
+def select_candidates(
+    target: Market,
+    markets: list[Market],
+    lookups: MarketLookups,
+    topk: int,
+    min_similarity: float,
+) -> list[Market]:
+    """Rank markets by Jaccard token overlap with the target question.
+
+    Totally unrelated questions ("Fed cuts rates" vs "Real Madrid wins")
+    can never be necessary implications, so there is no point paying
+    input tokens to ask the LLM about them. Keeps the topk most similar
+    markets above min_similarity, and drops candidates too expensive to
+    hedge the target profitably in either direction.
+    """
+    target_tokens = lookups.token_sets.get(target.id) or set(
+        target.question.lower().split()
+    )
+    # A candidate only matters if at least one pairing direction can
+    # total under $1: cover NO against target YES, or cover YES against
+    # target NO.
+    max_no_price = 1.0 - target.yes_price - MIN_HEDGE_EDGE
+    max_yes_price = 1.0 - target.no_price - MIN_HEDGE_EDGE
+    scored = []
+    for m in markets:
+        if m.id == target.id:
+            continue
+        if m.no_price > max_no_price and m.yes_price > max_yes_price:
+            continue
+        tokens = lookups.token_sets[m.id]
+        union = len(target_tokens | tokens)
+        if union == 0:
+            continue
+        sim = len(target_tokens & tokens) / union
+        if sim >= min_similarity:
+            scored.append((sim, m))
+    scored.sort(key=lambda pair: -pair[0])
+    return [m for _, m in scored[:topk]]
+
+
 def match_market_to_list(
     market_id: str,
     market_question: str,
     markets_by_id: dict[str, Market],
     markets_by_question: dict[str, Market],
+    token_index: dict[str, set[str]] | None = None,
 ) -> Market | None:
     """Match LLM output to actual market."""
     # Direct ID match
@@ -178,7 +430,30 @@ def match_market_to_list(
     if question_lower in markets_by_question:
         return markets_by_question[question_lower]
 
-    # Fuzzy match - substring
+    # Fuzzy match via inverted index: intersect the posting sets of the
+    # question's tokens; a unique survivor is the match, and an ambiguous
+    # intersection only needs a substring check over those few survivors
+    # instead of a scan over every market.
+    if token_index is not None:
+        candidate_ids: set[str] | None = None
+        for token in question_lower.split():
+            ids = token_index.get(token)
+            if not ids:
+                candidate_ids = None
+                break
+            candidate_ids = ids if candidate_ids is None else candidate_ids & ids
+            if not candidate_ids:
+                candidate_ids = None
+                break
+        if candidate_ids:
+            if len(candidate_ids) == 1:
+                return markets_by_id.get(next(iter(candidate_ids)))
+            for mid in candidate_ids:
+                market = markets_by_id.get(mid)
+                if market and question_lower in market.question.lower():
+                    return market
+
+    # Fuzzy match - substring (last resort, e.g. LLM paraphrased tokens)
     for q, market in markets_by_question.items():
         if question_lower in q or q in question_lower:
             return market
@@ -189,7 +464,7 @@ def match_market_to_list(
 def derive_covers_from_implications(
     llm_result: dict,
     target_market: Market,
-    other_markets: list[Market],
+    lookups: MarketLookups,
 ) -> list[dict]:
     """
     Derive cover relationships from LLM implications.
@@ -198,9 +473,9 @@ def derive_covers_from_implications(
     - "implied_by" (other -> target): contrapositive gives YES cover (buy NO on other)
     - "implies" (target -> other): direct gives NO cover (buy YES on other)
     """
-    # Build lookup tables
-    markets_by_id = {m.id: m for m in other_markets}
-    markets_by_question = {m.question.lower().strip(): m for m in other_markets}
+    markets_by_id = lookups.by_id
+    markets_by_question = lookups.by_question
+    token_index = lookups.token_index
 
     covers = []
 
@@ -212,7 +487,7 @@ def derive_covers_from_implications(
         other_question = item.get("market_question", "")
 
         matched = match_market_to_list(
-            other_id, other_question, markets_by_id, markets_by_question
+            other_id, other_question, markets_by_id, markets_by_question, token_index
         )
         if not matched or matched.id == target_market.id:
             continue
@@ -232,7 +507,7 @@ def derive_covers_from_implications(
         other_question = item.get("market_question", "")
 
         matched = match_market_to_list(
-            other_id, other_question, markets_by_id, markets_by_question
+            other_id, other_question, markets_by_id, markets_by_question, token_index
         )
         if not matched or matched.id == target_market.id:
             continue
@@ -248,39 +523,172 @@ def derive_covers_from_implications(
     return covers
 
 
+def build_market_lines(markets: list[Market]) -> dict[str, str]:
+    """Precompute the prompt line for each market, keyed by id.
+
+    Built once per scan so per-target calls only join existing strings
+    instead of re-formatting every line for every target.
+    """
+    return {m.id: f"- ID: {m.id}, Question: {m.question}" for m in markets}
+
+
+# Candidate markets per single-target prompt. Shorter lists keep the
+# model's attention (and JSON discipline) intact at large --limit; the
+# chunks run concurrently, so wall-clock is bounded by the slowest one.
+CANDIDATES_PER_PROMPT = 30
+
+
 async def extract_implications_for_market(
     target_market: Market,
     other_markets: list[Market],
     llm: LLMClient,
+    lookups: MarketLookups | None = None,
+    use_cache: bool = True,
 ) -> list[dict]:
     """Extract implications for a single target market."""
-    # Build market list for prompt
+    if lookups is None:
+        lookups = build_market_lookups(other_markets)
+
+    cache_key = None
+    if use_cache:
+        cache_key = _llm_cache_key(target_market.id, sorted(m.id for m in other_markets))
+        cached = _llm_cache_get(cache_key)
+        if cached is not None:
+            return derive_covers_from_implications(cached, target_market, lookups)
+
+    others = [m for m in other_markets if m.id != target_market.id]
+    if not others:
+        return []
+    chunks = [
+        others[i : i + CANDIDATES_PER_PROMPT]
+        for i in range(0, len(others), CANDIDATES_PER_PROMPT)
+    ]
+
+    async def _one_chunk(chunk: list[Market]) -> dict | None:
+        market_list_text = "\n".join(
+            lookups.lines.get(m.id, f"- ID: {m.id}, Question: {m.question}")
+            for m in chunk
+        )
+        prompt = IMPLICATION_PROMPT.format(
+            target_question=target_market.question,
+            market_list_text=market_list_text,
+        )
+        try:
+            response = await _stream_response(llm, prompt)
+            return extract_json_from_response(response)
+        except Exception as e:
+            print(f"Error extracting implications: {e}", file=sys.stderr)
+            return None
+
+    results = await asyncio.gather(*(_one_chunk(c) for c in chunks))
+
+    # Merge chunk results, deduping by market_id (first occurrence wins)
+    merged: dict = {"implied_by": [], "implies": []}
+    seen: dict[str, set] = {"implied_by": set(), "implies": set()}
+    parsed_any = False
+    for result in results:
+        if not result:
+            continue
+        parsed_any = True
+        for direction in ("implied_by", "implies"):
+            for item in result.get(direction) or []:
+                if not isinstance(item, dict):
+                    continue
+                mid = item.get("market_id", "")
+                if mid in seen[direction]:
+                    continue
+                seen[direction].add(mid)
+                merged[direction].append(item)
+
+    if not parsed_any:
+        return []
+
+    if cache_key is not None:
+        _llm_cache_set(cache_key, merged)
+
+    return derive_covers_from_implications(merged, target_market, lookups)
+
+
+async def extract_implications_batch(
+    targets: list[Market],
+    other_markets: list[Market],
+    llm: LLMClient,
+    lookups: MarketLookups | None = None,
+    use_cache: bool = True,
+) -> dict[str, list[dict]]:
+    """Extract implications for several targets in one LLM call.
+
+    One request listing all targets replaces len(targets) round-trips,
+    each of which would re-send the full market list. Returns a mapping
+    of target id to covers; falls back to per-target calls when the
+    batched response cannot be parsed.
+    """
+    if lookups is None:
+        lookups = build_market_lookups(other_markets)
+
+    covers_by_target: dict[str, list[dict]] = {}
+
+    # Serve cached targets without spending tokens; only the misses go
+    # into the batched request.
+    other_ids = sorted(m.id for m in other_markets)
+    if use_cache:
+        pending = []
+        for target in targets:
+            cached = _llm_cache_get(_llm_cache_key(target.id, other_ids))
+            if cached is not None:
+                covers_by_target[target.id] = derive_covers_from_implications(
+                    cached, target, lookups
+                )
+            else:
+                pending.append(target)
+        targets = pending
+        if not targets:
+            return covers_by_target
+
+    targets_list_text = "\n".join(
+        lookups.lines.get(t.id, f"- ID: {t.id}, Question: {t.question}")
+        for t in targets
+    )
     market_list_text = "\n".join(
-        f"- ID: {m.id}, Question: {m.question}" for m in other_markets if m.id != target_market.id
+        lookups.lines.get(m.id, f"- ID: {m.id}, Question: {m.question}")
+        for m in other_markets
     )
 
-    prompt = IMPLICATION_PROMPT.format(
-        target_question=target_market.question,
+    prompt = IMPLICATION_BATCH_PROMPT.format(
+        targets_list_text=targets_list_text,
         market_list_text=market_list_text,
     )
 
+    llm_result = None
     try:
-        response = await llm.complete(
-            [{"role": "user", "content": prompt}],
-            temperature=0.1,
-        )
-
+        response = await _stream_response(llm, prompt)
         llm_result = extract_json_from_response(response)
-        if not llm_result:
-            return []
-
-        return derive_covers_from_implications(
-            llm_result, target_market, other_markets
-        )
-
     except Exception as e:
-        print(f"Error extracting implications: {e}", file=sys.stderr)
-        return []
+        print(f"Error extracting implications (batch): {e}", file=sys.stderr)
+
+    targets_by_id = {t.id: t for t in targets}
+
+    if llm_result and isinstance(llm_result.get("results"), list):
+        for entry in llm_result["results"]:
+            if not isinstance(entry, dict):
+                continue
+            target = targets_by_id.get(str(entry.get("target_id", "")))
+            if target is None:
+                continue
+            if use_cache:
+                _llm_cache_set(_llm_cache_key(target.id, other_ids), entry)
+            covers_by_target[target.id] = derive_covers_from_implications(
+                entry, target, lookups
+            )
+        return covers_by_target
+
+    # Parse failure: retry each target individually with the single-target
+    # prompt, which smaller models follow more reliably.
+    for target in targets:
+        covers_by_target[target.id] = await extract_implications_for_market(
+            target, other_markets, llm, lookups, use_cache
+        )
+    return covers_by_target
 
 
 # =============================================================================
@@ -288,42 +696,52 @@ async def extract_implications_for_market(
 # =============================================================================
 
 
-def market_to_dict(market: Market) -> dict:
-    """Convert Market dataclass to dict for coverage functions."""
+@lru_cache(maxsize=1024)
+def _market_to_dict_cached(
+    market_id: str, question: str, slug: str, yes_price: float, no_price: float
+) -> dict:
     return {
-        "id": market.id,
-        "question": market.question,
-        "slug": market.slug,
-        "yes_price": market.yes_price,
-        "no_price": market.no_price,
+        "id": market_id,
+        "question": question,
+        "slug": slug,
+        "yes_price": yes_price,
+        "no_price": no_price,
     }
 
 
+def market_to_dict(market: Market) -> dict:
+    """Convert Market dataclass to dict for coverage functions.
+
+    The same market appears as a cover across many portfolios in one
+    scan; caching on the field values (Market uses slots, so no
+    cached_property) returns one shared read-only dict instead of
+    allocating a fresh one per appearance.
+    """
+    return _market_to_dict_cached(
+        market.id, market.question, market.slug, market.yes_price, market.no_price
+    )
+
+
 def build_portfolios_from_covers(
     target_market: Market,
     covers: list[dict],
-) -> list[dict]:
+) -> list[Portfolio]:
     """Build portfolio dicts from cover relationships."""
-    portfolios = []
     target_dict = market_to_dict(target_market)
 
-    for cover in covers:
-        cover_market = cover["cover_market"]
-        cover_dict = market_to_dict(cover_market)
-
-        portfolio = build_portfolio(
-            target_market=target_dict,
-            cover_market=cover_dict,
-            target_position=cover["target_position"],
-            cover_position=cover["cover_position"],
-            cover_probability=cover["probability"],
-            relationship=cover["relationship"],
+    candidates = [
+        (
+            target_dict,
+            market_to_dict(cover["cover_market"]),
+            cover["target_position"],
+            cover["cover_position"],
+            cover["probability"],
+            cover["relationship"],
         )
+        for cover in covers
+    ]
 
-        if portfolio:
-            portfolios.append(portfolio)
-
-    return portfolios
+    return build_portfolios_batch(candidates)
 
 
 # =============================================================================
@@ -331,35 +749,52 @@ def build_portfolios_from_covers(
 # =============================================================================
 
 
-def format_portfolio_row(p: dict) -> str:
+# Bound %-style formatter: compiled format spec is parsed once, and %
+# interpolation beats an f-string with seven specifiers per row.
+_ROW_FMT = "T%d %5.1f%% $%.2f %3s@%.2f %-38s | %3s@%.2f %s"
+
+
+def _trunc(s: str, n: int = 35) -> str:
+    return s if len(s) <= n else s[:n] + "..."
+
+
+def format_portfolio_row(p: Portfolio) -> str:
     """Format a portfolio as a table row."""
-    target_q = p["target_question"][:35] + "..." if len(p["target_question"]) > 35 else p["target_question"]
-    cover_q = p["cover_question"][:35] + "..." if len(p["cover_question"]) > 35 else p["cover_question"]
-
-    return (
-        f"T{p['tier']} {p['coverage']*100:5.1f}% "
-        f"${p['total_cost']:.2f} "
-        f"{p['target_position']:>3}@{p['target_price']:.2f} {target_q:<38} | "
-        f"{p['cover_position']:>3}@{p['cover_price']:.2f} {cover_q}"
+    return _ROW_FMT % (
+        p.tier,
+        p.coverage * 100,
+        p.total_cost,
+        p.target_position,
+        p.target_price,
+        _trunc(p.target_question),
+        p.cover_position,
+        p.cover_price,
+        _trunc(p.cover_question),
     )
 
 
-def print_portfolios_table(portfolios: list[dict]) -> None:
+def print_portfolios_table(portfolios: list[Portfolio]) -> None:
     """Print portfolios as formatted table."""
     if not portfolios:
         print("No covering portfolios found.")
         return
 
-    print(f"{'Tier':>4} {'Cov':>6} {'Cost':>6} {'Target':^45} | {'Cover'}")
-    print("-" * 120)
-
-    for p in portfolios:
-        print(format_portfolio_row(p))
+    # One write for the whole table instead of a syscall per row
+    lines = [
+        f"{'Tier':>4} {'Cov':>6} {'Cost':>6} {'Target':^45} | {'Cover'}",
+        "-" * 120,
+    ]
+    lines.extend(format_portfolio_row(p) for p in portfolios)
+    lines.append("")
+    sys.stdout.write("\n".join(lines))
 
 
-def print_portfolios_json(portfolios: list[dict]) -> None:
+def print_portfolios_json(portfolios: list[Portfolio]) -> None:
     """Print portfolios as JSON."""
-    print(json.dumps(portfolios, indent=2))
+    rows = [
+        asdict(p) | {"profit_pct": portfolio_profit_pct(p)} for p in portfolios
+    ]
+    print(json.dumps(rows, indent=2))
 
 
 # =============================================================================
@@ -367,6 +802,64 @@ def print_portfolios_json(portfolios: list[dict]) -> None:
 # =============================================================================
 
 
+class ProgressWriter:
+    """Throttled stderr progress writer.
+
+    Concurrent extraction emits progress from many tasks at once, and an
+    unbuffered stderr flush per message blocks the event loop. Lines are
+    buffered and written in one syscall at most every `interval`
+    seconds; call flush() when done to drain the remainder.
+    """
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self._lines: list[str] = []
+        self._last_flush = 0.0
+
+    def write(self, line: str) -> None:
+        self._lines.append(line)
+        if time.monotonic() - self._last_flush >= self.interval:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._lines:
+            sys.stderr.write("\n".join(self._lines) + "\n")
+            self._lines.clear()
+        self._last_flush = time.monotonic()
+
+
+def init_llm_from_env() -> LLMClient | None:
+    """Build the ARK-configured LLM client, or print what's missing.
+
+    Shared by cmd_scan and cmd_analyze, which previously carried
+    identical copies of this validation block. Returns None (after
+    printing the reason) when configuration is incomplete.
+    """
+    model_id = os.getenv("ARK_MODEL_ID")
+    api_key = os.getenv("ARK_API_KEY")
+    base_url = os.getenv("ARK_BASE_URL")
+
+    if not all([model_id, api_key, base_url]):
+        missing = [k for k, v in {
+            "ARK_MODEL_ID": model_id,
+            "ARK_API_KEY": api_key,
+            "ARK_BASE_URL": base_url
+        }.items() if not v]
+        print(f"Error: Missing environment variables: {', '.join(missing)}")
+        print("Please set them in your .env file or environment.")
+        return None
+
+    try:
+        return LLMClient(
+            model=model_id,
+            api_key=api_key,
+            base_url=base_url
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        return None
+
+
 async def cmd_scan(args):
     """Scan markets for hedging opportunities."""
     gamma = GammaClient()
@@ -384,11 +877,26 @@ async def cmd_scan(args):
         print("Need at least 2 markets to find hedges")
         return 1
 
-    # Filter out closed/resolved/settled markets (Temporal Guard)
-    active_markets = [
-        m for m in markets 
-        if not m.closed and not m.resolved and m.yes_price < 0.99 and m.no_price < 0.99
-    ]
+    # Filter out closed/resolved/settled markets (Temporal Guard).
+    # Columnar mask over price arrays rather than a per-market Python
+    # conditional; the win grows with --limit. The price band also drops
+    # near-resolved markets (price within --price-band of 0 or 1) that
+    # almost never yield a hedge worth its LLM call.
+    band = args.price_band
+    n = len(markets)
+    yes_prices = np.fromiter((m.yes_price for m in markets), dtype=np.float64, count=n)
+    no_prices = np.fromiter((m.no_price for m in markets), dtype=np.float64, count=n)
+    tradeable = np.fromiter(
+        (not m.closed and not m.resolved for m in markets), dtype=bool, count=n
+    )
+    keep = (
+        tradeable
+        & (yes_prices > band)
+        & (yes_prices < 1.0 - band)
+        & (no_prices > band)
+        & (no_prices < 1.0 - band)
+    )
+    active_markets = [m for m, k in zip(markets, keep) if k]
     if len(active_markets) < 2:
         print("No enough active markets after temporal filter.")
         return 0
@@ -396,72 +904,92 @@ async def cmd_scan(args):
     markets = active_markets
 
     # Initialize LLM client
-    try:
-        model_id = os.getenv("ARK_MODEL_ID")
-        api_key = os.getenv("ARK_API_KEY")
-        base_url = os.getenv("ARK_BASE_URL")
-
-        if not all([model_id, api_key, base_url]):
-            missing = [k for k, v in {
-                "ARK_MODEL_ID": model_id, 
-                "ARK_API_KEY": api_key, 
-                "ARK_BASE_URL": base_url
-            }.items() if not v]
-            print(f"Error: Missing environment variables: {', '.join(missing)}")
-            print("Please set them in your .env file or environment.")
-            return 1
-
-        llm = LLMClient(
-            model=model_id,
-            api_key=api_key,
-            base_url=base_url
-        )
-        #llm = LLMClient(model="google/gemini-2.0-flash-lite-001")
-        
-    except ValueError as e:
-        print(f"Error: {e}")
+    llm = init_llm_from_env()
+    if llm is None:
         return 1
 
     all_portfolios = []
 
-    # Extract implications for each market
+    # Extract implications in batched LLM calls: targets are grouped so one
+    # request covers BATCH_TARGETS_PER_CALL of them, and the batches are
+    # independent, so fan them out concurrently; the semaphore keeps us
+    # under provider rate limits while still hiding round-trip latency.
     print(f"Analyzing {len(markets)} markets for hedging relationships...", file=sys.stderr)
 
-    try:
-        for i, target in enumerate(markets):
-            if not args.json:
-                print(f"[{i+1}/{len(markets)}] {target.question[:60]}...", file=sys.stderr)
+    sem = asyncio.Semaphore(args.concurrency)
+    done = 0
+    total = len(markets)
+    progress = ProgressWriter()
+    lookups = build_market_lookups(markets)
+    batches = [
+        markets[i : i + BATCH_TARGETS_PER_CALL]
+        for i in range(0, total, BATCH_TARGETS_PER_CALL)
+    ]
+
+    async def _extract_bounded(batch: list[Market]):
+        nonlocal done
+        # Cheap lexical pre-filter: only candidates sharing vocabulary
+        # with at least one target in the batch go into the prompt.
+        candidate_ids: set[str] = set()
+        for target in batch:
+            candidate_ids.update(
+                m.id
+                for m in select_candidates(
+                    target, markets, lookups, args.topk, args.min_similarity
+                )
+            )
+        candidates = [m for m in markets if m.id in candidate_ids]
+        if not candidates:
+            done += len(batch)
+            return batch, {}
+        async with sem:
+            covers_by_target = await extract_implications_batch(
+                batch, candidates, llm, lookups, use_cache=not args.no_cache
+            )
+        done += len(batch)
+        if not args.json:
+            progress.write(f"[{done}/{total}] markets analyzed")
+        return batch, covers_by_target
 
-            covers = await extract_implications_for_market(target, markets, llm)
+    try:
+        results = await asyncio.gather(
+            *(_extract_bounded(b) for b in batches),
+            return_exceptions=True,
+        )
+    finally:
+        progress.flush()
+        await llm.close()
 
+    for result in results:
+        if isinstance(result, BaseException):
+            progress.write(f"Error extracting implications: {result}")
+            continue
+        batch, covers_by_target = result
+        for target in batch:
+            covers = covers_by_target.get(target.id)
             if covers:
                 portfolios = build_portfolios_from_covers(target, covers)
                 all_portfolios.extend(portfolios)
 
                 if not args.json and portfolios:
-                    print(f"  Found {len(portfolios)} potential hedges", file=sys.stderr)
-
-    finally:
-        await llm.close()
-
-    # Filter and sort
-    if args.min_coverage:
-        all_portfolios = filter_portfolios_by_coverage(all_portfolios, args.min_coverage)
-
-    if args.tier:
-        all_portfolios = filter_portfolios_by_tier(all_portfolios, args.tier)
+                    progress.write(f"  Found {len(portfolios)} potential hedges")
+    progress.flush()
+
+    # Filter and sort in one columnar pass; sorting before the dedup
+    # means the best-ranked of each symmetric pair is the one kept.
+    all_portfolios = filter_sort_portfolios_batch(
+        all_portfolios,
+        min_coverage=args.min_coverage or 0.0,
+        max_tier=args.tier or 4,
+    )
 
-    # Deduplicate symmetric pairs (A hedges B and B hedges A)
-    unique_portfolios = []
-    seen_pairs = set()
+    # Deduplicate symmetric pairs (A hedges B and B hedges A); frozenset
+    # keys need no per-pair sort, and setdefault keeps the first
+    # occurrence.
+    unique_portfolios: dict[frozenset, Portfolio] = {}
     for p in all_portfolios:
-        pair = tuple(sorted([p["target_id"], p["cover_id"]]))
-        if pair not in seen_pairs:
-            unique_portfolios.append(p)
-            seen_pairs.add(pair)
-    all_portfolios = unique_portfolios
-
-    all_portfolios = sort_portfolios(all_portfolios)
+        unique_portfolios.setdefault(frozenset((p.target_id, p.cover_id)), p)
+    all_portfolios = list(unique_portfolios.values())
 
     # Output
     print(f"\n=== Found {len(all_portfolios)} high-quality covering portfolios ===\n", file=sys.stderr)
@@ -491,46 +1019,23 @@ async def cmd_analyze(args):
     print(f"Market 2: {market2.question}", file=sys.stderr)
 
     # Initialize LLM client
-    try:
-        model_id = os.getenv("ARK_MODEL_ID")
-        api_key = os.getenv("ARK_API_KEY")
-        base_url = os.getenv("ARK_BASE_URL")
-
-        if not all([model_id, api_key, base_url]):
-            missing = [k for k, v in {
-                "ARK_MODEL_ID": model_id, 
-                "ARK_API_KEY": api_key, 
-                "ARK_BASE_URL": base_url
-            }.items() if not v]
-            print(f"Error: Missing environment variables: {', '.join(missing)}")
-            print("Please set them in your .env file or environment.")
-            return 1
-
-        llm = LLMClient(
-            model=model_id,
-            api_key=api_key,
-            base_url=base_url
-        )
-        # llm = LLMClient(model="google/gemini-2.0-flash-lite-001")
-        
-    except ValueError as e:
-        print(f"Error: {e}")
+    llm = init_llm_from_env()
+    if llm is None:
         return 1
 
     all_portfolios = []
 
     try:
-        # Check both directions
+        # Check both directions concurrently
         print(f"\nAnalyzing implications...", file=sys.stderr)
 
-        # Market 1 as target
-        covers1 = await extract_implications_for_market(market1, [market2], llm)
+        covers1, covers2 = await asyncio.gather(
+            extract_implications_for_market(market1, [market2], llm),
+            extract_implications_for_market(market2, [market1], llm),
+        )
         if covers1:
             portfolios1 = build_portfolios_from_covers(market1, covers1)
             all_portfolios.extend(portfolios1)
-
-        # Market 2 as target
-        covers2 = await extract_implications_for_market(market2, [market1], llm)
         if covers2:
             portfolios2 = build_portfolios_from_covers(market2, covers2)
             all_portfolios.extend(portfolios2)
@@ -561,7 +1066,7 @@ async def cmd_analyze(args):
         print_portfolios_table(all_portfolios)
         print("\nRelationships:")
         for p in all_portfolios:
-            print(f"  - {p['relationship']}")
+            print(f"  - {p.relationship}")
 
     return 0
 
@@ -583,6 +1088,11 @@ def main():
     scan_parser.add_argument("--limit", type=int, default=20, help="Number of markets to scan (default: 20)")
     scan_parser.add_argument("--min-coverage", type=float, default=0.85, help="Minimum coverage threshold (default: 0.85)")
     scan_parser.add_argument("--tier", type=int, default=2, help="Maximum tier to include (1=best, default: 2)")
+    scan_parser.add_argument("--concurrency", type=int, default=8, help="Max concurrent LLM requests (default: 8)")
+    scan_parser.add_argument("--no-cache", action="store_true", help="Skip the on-disk LLM result cache")
+    scan_parser.add_argument("--topk", type=int, default=15, help="Max candidate markets per target sent to the LLM (default: 15)")
+    scan_parser.add_argument("--min-similarity", type=float, default=0.1, help="Min token-overlap similarity for candidates (default: 0.1)")
+    scan_parser.add_argument("--price-band", type=float, default=0.01, help="Drop markets priced within this band of 0 or 1 (default: 0.01)")
 
     # Analyze command
     analyze_parser = subparsers.add_parser("analyze", help="Analyze specific market pair")
@@ -16,8 +16,8 @@ Usage:
     polyclaw hedge analyze <id1> <id2>
 """
 
+import importlib
 import sys
-import subprocess
 from pathlib import Path
 
 # Load .env file from skill root directory (for OpenClaw env var injection)
@@ -25,20 +25,42 @@ from dotenv import load_dotenv
 SKILL_DIR = Path(__file__).parent.parent
 load_dotenv(SKILL_DIR / ".env")
 
-# Script directory
+# Script directory (on sys.path so command modules import by name)
 SCRIPT_DIR = Path(__file__).parent
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
 
 
 def run_script(script_name: str, args: list[str]) -> int:
-    """Run a script with arguments."""
-    script_path = SCRIPT_DIR / f"{script_name}.py"
-    if not script_path.exists():
-        print(f"Error: Script not found: {script_path}")
+    """Dispatch to a command module in-process.
+
+    Forking a fresh interpreter per subcommand paid interpreter startup
+    plus cold imports on every invocation; importing the module and
+    calling its main() directly skips both.
+    """
+    try:
+        module = importlib.import_module(script_name)
+    except ModuleNotFoundError as e:
+        # Only the command module itself being absent is "script not
+        # found"; a missing transitive dependency is a real error and
+        # must surface as such.
+        if e.name != script_name:
+            raise
+        print(f"Error: Script not found: {SCRIPT_DIR / (script_name + '.py')}")
         return 1
 
-    cmd = [sys.executable, str(script_path)] + args
-    result = subprocess.run(cmd)
-    return result.returncode
+    argv_backup = sys.argv
+    sys.argv = [script_name, *args]
+    try:
+        return module.main() or 0
+    except SystemExit as e:
+        # argparse and the scripts' own sys.exit calls land here
+        if isinstance(e.code, int) or e.code is None:
+            return e.code or 0
+        print(e.code, file=sys.stderr)
+        return 1
+    finally:
+        sys.argv = argv_backup
 
 
 def main():
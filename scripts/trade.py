@@ -15,17 +15,27 @@ from pathlib import Path
 # Add parent to path for lib imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-# Load .env file from skill root directory
-from dotenv import load_dotenv
-load_dotenv(Path(__file__).parent.parent / ".env")
+# Heavy dependencies (web3 via lib.executor, py_clob_client) are imported
+# lazily inside the commands that need them, so --help and test imports
+# don't pay a few hundred ms of interpreter warmup per invocation.
 
-from web3 import Web3
+# Optional fast event loop (perf extra).
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
 
-from lib.wallet_manager import WalletManager
-from lib.gamma_client import GammaClient, Market
-from lib.clob_client import ClobClientWrapper
-from lib.contracts import CONTRACTS, CTF_ABI, POLYGON_CHAIN_ID
-from lib.position_storage import PositionStorage, PositionEntry
+# orjson serializes dataclasses natively in one C call, skipping the
+# reflective asdict() deep copy; fall back to stdlib when not installed.
+try:
+    from orjson import OPT_INDENT_2 as _OPT_INDENT_2, dumps as _dumps
+
+    def _to_json(obj) -> str:
+        return _dumps(obj, option=_OPT_INDENT_2).decode()
+except ImportError:
+    def _to_json(obj) -> str:
+        return json.dumps(asdict(obj), indent=2)
 
 
 @dataclass
@@ -45,25 +55,36 @@ class TradeResult:
     entry_price: float = 0.0
 
 
-from lib.executor import ExecutionEngine
-
 async def buy_position(
     market_id: str,
     position: str,
     amount: float,
     skip_clob_sell: bool = False,
+    engine=None,
 ) -> TradeResult:
-    """Buy a position using the unified ExecutionEngine."""
-    wallet = WalletManager()
-    if not wallet.is_unlocked:
-        return TradeResult(success=False, market_id=market_id, position=position, amount=amount, split_tx=None, clob_order_id=None, clob_filled=False, error="Wallet locked")
-        
-    engine = ExecutionEngine(wallet)
+    """Buy a position using the unified ExecutionEngine.
+
+    Pass an existing engine to chain multiple buys without paying the
+    wallet-unlock and CLOB-client setup again for each call.
+    """
+    if engine is None:
+        from lib.executor import ExecutionEngine
+        from lib.wallet_manager import WalletManager
+
+        wallet = WalletManager()
+        if not wallet.is_unlocked:
+            return TradeResult(success=False, market_id=market_id, position=position, amount=amount, split_tx=None, clob_order_id=None, clob_filled=False, error="Wallet locked")
+
+        engine = ExecutionEngine(wallet)
     try:
+        # Prefetch market metadata concurrently with the on-chain split
+        # (the long leg), instead of serializing a second round-trip
+        # after the transaction just to fill in the TradeResult.
+        market_task = asyncio.create_task(engine.gamma.get_market(market_id))
         res = await engine.split_and_sell(market_id, position, amount, skip_sell=skip_clob_sell)
-        
-        market = await engine.gamma.get_market(market_id)
-        
+
+        market = await market_task
+
         return TradeResult(
             success=res["success"],
             market_id=market_id,
@@ -78,11 +99,14 @@ async def buy_position(
             entry_price=market.yes_price if position == "YES" else market.no_price
         )
     except Exception as e:
+        market_task.cancel()
         return TradeResult(success=False, market_id=market_id, position=position, amount=amount, split_tx=None, clob_order_id=None, clob_filled=False, error=str(e))
 
 
 async def cmd_buy(args):
     """Execute buy command."""
+    from lib.wallet_manager import WalletManager
+
     wallet = WalletManager()
 
     if not wallet.is_unlocked:
@@ -91,12 +115,15 @@ async def cmd_buy(args):
         return 1
 
     try:
-        executor = TradeExecutor(wallet)
-        result = await executor.buy_position(
+        from lib.executor import ExecutionEngine
+
+        engine = ExecutionEngine(wallet)
+        result = await buy_position(
             args.market_id,
             args.position,
             args.amount,
             skip_clob_sell=args.skip_sell,
+            engine=engine,
         )
 
         print("\n" + "=" * 50)
@@ -119,6 +146,8 @@ async def cmd_buy(args):
                 print(f"  Note: You have {result.amount:.0f} {unwanted} tokens to sell manually")
 
             # Record position
+            from lib.position_storage import PositionEntry, PositionStorage
+
             storage = PositionStorage()
             position_entry = PositionEntry(
                 position_id=str(uuid.uuid4()),
@@ -142,7 +171,7 @@ async def cmd_buy(args):
         # Output JSON if requested
         if args.json:
             print("\nJSON Result:")
-            print(json.dumps(asdict(result), indent=2))
+            print(_to_json(result))
 
         return 0
 
@@ -151,6 +180,10 @@ async def cmd_buy(args):
 
 
 def main():
+    # Load .env file from skill root directory
+    from dotenv import load_dotenv
+    load_dotenv(Path(__file__).parent.parent / ".env")
+
     parser = argparse.ArgumentParser(description="Trade execution")
     parser.add_argument("--json", action="store_true", help="JSON output")
     subparsers = parser.add_subparsers(dest="command", help="Commands")
@@ -0,0 +1,29 @@
+"""Shared test setup: stub out heavy on-chain dependencies.
+
+No unit test here touches the chain, but importing scripts/lib modules
+can transitively pull in web3/eth_account/py_clob_client, which cost
+hundreds of ms of interpreter warmup (or fail outright in minimal
+environments). Pre-populate sys.modules with lazy stubs BEFORE any test
+module imports — only for packages that are genuinely absent, so an
+installed real package is always preferred.
+"""
+
+import importlib.util
+import sys
+import types
+from unittest.mock import MagicMock
+
+_HEAVY_MODULES = ("web3", "eth_account", "py_clob_client")
+
+
+def _stub_module(name: str) -> types.ModuleType:
+    mod = types.ModuleType(name)
+    # PEP 562 module __getattr__: any `from name import X` resolves to a
+    # MagicMock instead of raising ImportError.
+    mod.__getattr__ = lambda attr: MagicMock()
+    return mod
+
+
+for _name in _HEAVY_MODULES:
+    if _name not in sys.modules and importlib.util.find_spec(_name) is None:
+        sys.modules[_name] = _stub_module(_name)
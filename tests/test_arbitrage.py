@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from lib.arbitrage import (
+    calculate_negrisk_arbitrage,
+    negrisk_group_costs,
+    scan_negrisk_groups,
+)
+
+
+def _market(yes_price: float, mid: str = "m1") -> SimpleNamespace:
+    return SimpleNamespace(
+        id=mid,
+        question=f"Question {mid}?",
+        yes_price=yes_price,
+        yes_token_id=f"tok-{mid}",
+    )
+
+
+def test_negrisk_group_costs_match_scalar():
+    groups = [
+        [_market(0.30, "a1"), _market(0.40, "a2")],
+        [_market(0.50, "b1"), _market(0.45, "b2"), _market(0.10, "b3")],
+        [_market(0.95, "c1")],
+    ]
+
+    costs = negrisk_group_costs(groups)
+    expected = [calculate_negrisk_arbitrage(g).total_cost for g in groups]
+
+    np.testing.assert_allclose(costs, expected)
+
+
+def test_scan_negrisk_groups_only_materializes_profitable():
+    profitable = [_market(0.30, "a1"), _market(0.40, "a2")]
+    losing = [_market(0.60, "b1"), _market(0.60, "b2")]
+
+    portfolios = scan_negrisk_groups([profitable, losing], min_profit=0.05)
+
+    assert len(portfolios) == 1
+    assert portfolios[0].total_cost == 0.70
+
+
+def test_negrisk_group_costs_empty():
+    assert negrisk_group_costs([]).size == 0
+    assert scan_negrisk_groups([]) == []
+
+
+def test_negrisk_empty_group_is_not_an_arbitrage():
+    groups = [
+        [_market(0.30, "a1"), _market(0.40, "a2")],
+        [],
+        [_market(0.50, "c1"), _market(0.20, "c2")],
+    ]
+
+    np.testing.assert_allclose(negrisk_group_costs(groups), [0.70, 0.0, 0.70])
+
+    portfolios = scan_negrisk_groups(groups, min_profit=0.05)
+    assert len(portfolios) == 2
+    assert all(p.legs for p in portfolios)
@@ -0,0 +1,35 @@
+import numpy as np
+
+from lib.clob_client import _parse_book_levels, _walk_book
+
+
+def test_parse_book_levels():
+    orders = [("0.55", "100"), ("0.50", "50.5")]
+    prices, sizes = _parse_book_levels(orders)
+
+    assert prices.dtype == np.float64
+    assert prices.tolist() == [0.55, 0.50]
+    assert sizes.tolist() == [100.0, 50.5]
+
+
+def test_walk_book_sell_fills_within_limit():
+    # Bids ordered high -> low
+    prices = np.array([0.60, 0.55, 0.50])
+    sizes = np.array([40.0, 40.0, 40.0])
+
+    assert _walk_book(prices, sizes, 0.50, 100.0, True)
+    assert not _walk_book(prices, sizes, 0.55, 100.0, True)
+
+
+def test_walk_book_buy_stops_at_first_expensive_ask():
+    # Asks ordered low -> high
+    prices = np.array([0.10, 0.20, 0.90])
+    sizes = np.array([50.0, 50.0, 500.0])
+
+    assert _walk_book(prices, sizes, 0.20, 100.0, False)
+    assert not _walk_book(prices, sizes, 0.20, 101.0, False)
+
+
+def test_walk_book_empty():
+    empty = np.array([], dtype=np.float64)
+    assert not _walk_book(empty, empty, 0.5, 1.0, True)
@@ -0,0 +1,151 @@
+import numpy as np
+
+from lib.coverage import (
+    build_portfolio,
+    build_portfolios_batch,
+    calculate_coverage_metrics,
+    calculate_coverage_metrics_batch,
+    build_portfolios_vectorized,
+    classify_tier,
+    classify_tier_batch,
+    filter_portfolios_by_coverage,
+    filter_portfolios_by_tier,
+    filter_sort_portfolios_batch,
+    sort_portfolios,
+)
+
+
+def _market(yes_price: float, mid: str = "m1") -> dict:
+    return {
+        "id": mid,
+        "question": f"Question {mid}?",
+        "slug": f"question-{mid}",
+        "yes_price": yes_price,
+        "no_price": round(1 - yes_price, 4),
+    }
+
+
+def test_batch_metrics_match_scalar():
+    cases = [(0.80, 0.98, 0.95), (0.50, 0.98, 0.60), (0.10, 0.99, 1.05)]
+
+    batch = calculate_coverage_metrics_batch(
+        np.array([c[0] for c in cases]),
+        np.array([c[1] for c in cases]),
+        np.array([c[2] for c in cases]),
+    )
+
+    for i, (target, prob, cost) in enumerate(cases):
+        scalar = calculate_coverage_metrics(target, prob, cost)
+        assert batch["coverage"][i] == scalar["coverage"]
+        assert batch["loss_probability"][i] == scalar["loss_probability"]
+        assert batch["expected_profit"][i] == scalar["expected_profit"]
+
+
+def test_batch_portfolios_match_scalar():
+    candidates = [
+        (_market(0.80, "t1"), _market(0.15, "c1"), "YES", "YES", 0.98, "necessary"),
+        (_market(0.07, "t2"), _market(0.07, "c2"), "NO", "YES", 0.98, "hallucinated"),
+        (_market(0.50, "t3"), _market(0.45, "c3"), "YES", "YES", 0.98, "necessary"),
+    ]
+
+    batch = build_portfolios_batch(candidates)
+    scalar = [p for p in (build_portfolio(*c) for c in candidates) if p]
+
+    assert batch == scalar
+
+
+def test_batch_metrics_match_scalar_randomized():
+    # Exact 5-decimal inputs land some results on rounding ties (e.g.
+    # 0.95175), where stdlib round() and np.round disagree; both paths
+    # must round identically for these to pass.
+    rng = np.random.default_rng(20260901)
+    targets = rng.integers(1, 99999, 500) / 100000.0
+    probs = rng.uniform(0.5, 1.0, 500).round(5)
+    probs[rng.random(500) < 0.4] = 1.0
+    costs = rng.integers(1, 150000, 500) / 100000.0
+
+    batch = calculate_coverage_metrics_batch(targets, probs, costs)
+
+    for i in range(targets.size):
+        scalar = calculate_coverage_metrics(
+            float(targets[i]), float(probs[i]), float(costs[i])
+        )
+        assert batch["coverage"][i] == scalar["coverage"]
+        assert batch["loss_probability"][i] == scalar["loss_probability"]
+        assert batch["expected_profit"][i] == scalar["expected_profit"]
+
+
+def test_batch_portfolios_match_scalar_randomized():
+    rng = np.random.default_rng(20260902)
+    candidates = []
+    for i in range(200):
+        target = _market(int(rng.integers(1, 99999)) / 100000.0, f"t{i}")
+        cover = _market(int(rng.integers(1, 99999)) / 100000.0, f"c{i}")
+        target_pos = "YES" if rng.random() < 0.5 else "NO"
+        cover_pos = "YES" if rng.random() < 0.5 else "NO"
+        prob = round(float(rng.uniform(0.5, 1.0)), 5)
+        candidates.append((target, cover, target_pos, cover_pos, prob, "necessary"))
+
+    batch = build_portfolios_batch(candidates)
+    scalar = [p for p in (build_portfolio(*c) for c in candidates) if p]
+
+    assert batch == scalar
+
+
+def test_classify_tier():
+    assert classify_tier(0.96, 0.95) == (1, "HIGH")
+    assert classify_tier(0.92, 0.95) == (2, "GOOD")
+    assert classify_tier(0.87, 0.95) == (3, "MODERATE")
+    assert classify_tier(0.50, 0.95) == (4, "LOW")
+    # Cost >= 1.0 forces tier 4 regardless of coverage
+    assert classify_tier(0.99, 1.0) == (4, "LOW")
+
+
+def test_classify_tier_batch():
+    tiers = classify_tier_batch(
+        np.array([0.96, 0.92, 0.87, 0.50, 0.99]),
+        np.array([0.95, 0.95, 0.95, 0.95, 1.2]),
+    )
+    assert tiers.tolist() == [1, 2, 3, 4, 4]
+
+
+def test_vectorized_pairs_match_scalar():
+    targets = [_market(0.80, "t1"), _market(0.07, "t2"), _market(0.95, "t3")]
+    covers = [_market(0.15, "c1"), _market(0.45, "c2")]
+
+    vectorized = build_portfolios_vectorized(
+        targets, covers, "YES", "YES", 0.98, "necessary"
+    )
+    scalar = [
+        p
+        for t in targets
+        for c in covers
+        if (p := build_portfolio(t, c, "YES", "YES", 0.98, "necessary"))
+    ]
+
+    assert vectorized == scalar
+
+
+def test_batch_portfolios_empty():
+    assert build_portfolios_batch([]) == []
+    assert build_portfolios_vectorized([], [], "YES", "YES", 0.98, "x") == []
+
+
+def test_filter_sort_batch_matches_scalar():
+    candidates = [
+        (_market(0.80, "t1"), _market(0.15, "c1"), "YES", "YES", 0.98, "necessary"),
+        (_market(0.50, "t2"), _market(0.45, "c2"), "YES", "YES", 0.98, "necessary"),
+        (_market(0.90, "t3"), _market(0.05, "c3"), "YES", "YES", 0.98, "necessary"),
+        (_market(0.30, "t4"), _market(0.60, "c4"), "YES", "YES", 0.98, "necessary"),
+    ]
+    portfolios = build_portfolios_batch(candidates)
+
+    batch = filter_sort_portfolios_batch(portfolios, min_coverage=0.85, max_tier=2)
+    scalar = sort_portfolios(
+        filter_portfolios_by_tier(
+            filter_portfolios_by_coverage(portfolios, 0.85), 2
+        )
+    )
+
+    assert batch == scalar
+    assert filter_sort_portfolios_batch([], min_coverage=0.85, max_tier=2) == []
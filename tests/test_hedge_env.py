@@ -4,8 +4,33 @@ import sys
 from unittest.mock import MagicMock, patch, AsyncMock
 from scripts.hedge import cmd_scan, cmd_analyze
 
+
+@pytest.fixture(scope="module")
+def fake_markets():
+    """Two minimal tradeable markets, shared read-only across tests.
+
+    The questions overlap heavily and prices sum below $1, so the pair
+    survives the price-band and hedge-edge filters and actually reaches
+    the implication-extraction path.
+    """
+    def mk(mid, question):
+        m = MagicMock()
+        m.id = mid
+        m.question = question
+        m.slug = mid
+        m.closed = False
+        m.resolved = False
+        m.yes_price = 0.5
+        m.no_price = 0.45
+        return m
+    return [
+        mk("m1", "Will BTC close above 100k in 2026?"),
+        mk("m2", "Will BTC close above 90k in 2026?"),
+    ]
+
+
 @pytest.mark.asyncio
-async def test_cmd_scan_fails_missing_env(capsys):
+async def test_cmd_scan_fails_missing_env(capsys, fake_markets):
     """Test that cmd_scan fails when ARK_* env vars are missing."""
     # Ensure env vars are NOT set
     env_patch = {
@@ -18,25 +43,13 @@ async def test_cmd_scan_fails_missing_env(capsys):
         # Mock GammaClient to avoid network calls
         with patch("scripts.hedge.GammaClient") as mock_gamma:
             mock_gamma_inst = mock_gamma.return_value
-            
-            m1 = MagicMock()
-            m1.closed = False
-            m1.resolved = False
-            m1.yes_price = 0.5
-            m1.no_price = 0.5
-            
-            m2 = MagicMock()
-            m2.closed = False
-            m2.resolved = False
-            m2.yes_price = 0.5
-            m2.no_price = 0.5
-            
-            mock_gamma_inst.get_trending_markets = AsyncMock(return_value=[m1, m2])
-            
+            mock_gamma_inst.get_trending_markets = AsyncMock(return_value=fake_markets)
+
             args = MagicMock()
             args.query = None
             args.limit = 20
-            
+            args.price_band = 0.01
+
             result = await cmd_scan(args)
             
             # This should fail with return code 1
@@ -45,7 +58,7 @@ async def test_cmd_scan_fails_missing_env(capsys):
             assert "Error: Missing environment variables" in captured.out
 
 @pytest.mark.asyncio
-async def test_cmd_scan_succeeds_with_env():
+async def test_cmd_scan_succeeds_with_env(fake_markets):
     """Test that cmd_scan continues with LLM initialization when env vars are present."""
     env_patch = {
         "ARK_MODEL_ID": "test-model",
@@ -56,21 +69,8 @@ async def test_cmd_scan_succeeds_with_env():
     with patch.dict(os.environ, env_patch, clear=False):
         with patch("scripts.hedge.GammaClient") as mock_gamma:
             mock_gamma_inst = mock_gamma.return_value
-            
-            m1 = MagicMock()
-            m1.closed = False
-            m1.resolved = False
-            m1.yes_price = 0.5
-            m1.no_price = 0.5
-            
-            m2 = MagicMock()
-            m2.closed = False
-            m2.resolved = False
-            m2.yes_price = 0.5
-            m2.no_price = 0.5
-            
-            mock_gamma_inst.get_trending_markets = AsyncMock(return_value=[m1, m2])
-            
+            mock_gamma_inst.get_trending_markets = AsyncMock(return_value=fake_markets)
+
             # Mock LLMClient to avoid actual initialization and calls
             with patch("scripts.hedge.LLMClient") as mock_llm:
                 # Mock the close method which is awaited
@@ -82,10 +82,16 @@ async def test_cmd_scan_succeeds_with_env():
                 args.json = False
                 args.min_coverage = 0.85
                 args.tier = 2
+                args.concurrency = 8
+                args.no_cache = True
+                args.topk = 15
+                args.min_similarity = 0.1
+                args.price_band = 0.01
                 
-                # We expect it to reach the market analysis loop
-                with patch("scripts.hedge.extract_implications_for_market") as mock_extract:
-                    mock_extract.return_value = []
+                # We expect it to reach the batched extraction path
+                with patch("scripts.hedge.extract_implications_batch") as mock_extract:
+                    mock_extract.return_value = {}
                     await cmd_scan(args)
-                    
+
                     mock_llm.assert_called_once()
+                    assert mock_extract.await_count >= 1